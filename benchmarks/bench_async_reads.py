@@ -0,0 +1,39 @@
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'secure_result'))
+import db
+import adb
+
+def seed(n_students: int, complaints_per_student: int):
+    with db.transaction() as conn:
+        conn.executemany('INSERT INTO complaints (student_username, text, status) VALUES (?, ?, ?)', ((f'student{i}', f'complaint {i}-{j} about marks', 'Pending') for i in range(n_students) for j in range(complaints_per_student)))
+
+def read_one(i: int, n_students: int):
+    return (db.get_complaints_by_student(f'student{i % n_students}'), db.count_complaints({'status': 'Pending'}))
+
+async def read_all_async(n_reads: int, n_students: int):
+    async def read(i: int):
+        return (await adb.get_complaints_by_student(f'student{i % n_students}'), await adb.count_complaints({'status': 'Pending'}))
+    return await asyncio.gather(*(read(i) for i in range(n_reads)))
+
+def main(n_reads: int=2000, n_students: int=500):
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / 'bench.sqlite3'
+        db.init_db()
+        seed(n_students, 40)
+        start = time.perf_counter()
+        sync_rows = [read_one(i, n_students) for i in range(n_reads)]
+        sync_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        async_rows = asyncio.run(read_all_async(n_reads, n_students))
+        async_elapsed = time.perf_counter() - start
+        assert sync_rows == [tuple(r) for r in async_rows]
+        adb.shutdown()
+        db.close_pool()
+    print(f'reads={n_reads} sync_seconds={sync_elapsed:.2f} sync_reads_per_sec={n_reads / sync_elapsed:,.0f}')
+    print(f'reads={n_reads} async_seconds={async_elapsed:.2f} async_reads_per_sec={n_reads / async_elapsed:,.0f} workers={adb.MAX_WORKERS}')
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,26 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+sys.path.insert(0, str(Path(__file__).parent.parent / 'secure_result'))
+import db
+
+def make_results_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    ids = np.arange(n_rows)
+    return pd.DataFrame({'student_username': (12200000 + ids // 8).astype(str), 'course_code': 'ITPC' + pd.Series(ids % 8 * 100 + 4).astype(str), 'course_name': 'Course', 'semester': '4', 'marks': rng.integers(0, 100, n_rows), 'status': np.where(ids % 5 == 0, 'Fail', 'Pass')})
+
+def main(n_rows: int=200000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / 'bench.sqlite3'
+        db.init_db()
+        df = make_results_frame(n_rows)
+        start = time.perf_counter()
+        result = db.import_results_from_dataframe(df)
+        elapsed = time.perf_counter() - start
+        db.close_pool()
+    print(f"rows={n_rows} inserted={result['inserted']} errors={result['errors']} seconds={elapsed:.2f} rows_per_sec={n_rows / elapsed:,.0f}")
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
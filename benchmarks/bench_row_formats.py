@@ -0,0 +1,42 @@
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'secure_result'))
+import db
+
+def measure(n_rows: int, row_format: str):
+    start = time.perf_counter()
+    rows = db.get_all_complaints(limit=n_rows, row_format=row_format)
+    build_seconds = time.perf_counter() - start
+    tracemalloc.start()
+    rows = db.get_all_complaints(limit=n_rows, row_format=row_format)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    if row_format == 'columnar':
+        pending = sum((1 for status in rows['status'] if status == 'Pending'))
+    elif row_format == 'compact':
+        pending = sum((1 for row in rows if row.status == 'Pending'))
+    else:
+        pending = sum((1 for row in rows if row.get('status') == 'Pending'))
+    access_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    if row_format != 'columnar':
+        sum((1 for row in rows if row.get('status') == 'Pending'))
+    get_seconds = time.perf_counter() - start
+    return (build_seconds, memory, access_seconds, get_seconds, pending)
+
+def main(n_rows: int=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / 'bench.sqlite3'
+        db.init_db()
+        with db.transaction() as conn:
+            conn.executemany('INSERT INTO complaints (student_username, text, predicted_category, confidence, status, course_code, semester) VALUES (?, ?, ?, ?, ?, ?, ?)', ((f'student{i % 5000}', f'complaint text {i}', str(i % 4), 0.5, 'Pending' if i % 3 else 'Resolved', f'ITPC{i % 8}04', str(i % 8)) for i in range(n_rows)))
+        for row_format in db.ROW_FORMATS:
+            build_seconds, memory, access_seconds, get_seconds, pending = measure(n_rows, row_format)
+            print(f'format={row_format} rows={n_rows} build_seconds={build_seconds:.3f} memory_mb={memory / 1000000.0:.1f} access_seconds={access_seconds:.3f} get_seconds={get_seconds:.3f} pending={pending}')
+        db.close_pool()
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,55 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+sys.path.insert(0, str(Path(__file__).parent.parent / 'secure_result'))
+import vector_index
+
+def make_embeddings(n_rows: int, dim: int=384) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((max(1, n_rows // 100), dim)).astype(np.float32)
+    return (centers[rng.integers(0, len(centers), n_rows)] + rng.standard_normal((n_rows, dim)).astype(np.float32)) * 4.0
+
+def private_rss_mb() -> float:
+    with open('/proc/self/statm') as f:
+        resident, shared = (int(v) for v in f.read().split()[1:3])
+    return (resident - shared) * 4096 / 1000000.0
+
+def cosine_argsort(embeddings: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    similarities = normalized @ (query / np.linalg.norm(query))
+    return np.argsort(similarities)[::-1][:k]
+
+def time_queries(search, queries: np.ndarray) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1000.0
+
+def main(n_rows: int=100000, n_queries: int=50, k: int=3):
+    embeddings = make_embeddings(n_rows)
+    queries = embeddings[np.random.default_rng(1).choice(n_rows, n_queries, replace=False)] + 0.5
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / 'legacy.npy'
+        np.save(legacy_path, embeddings)
+        del embeddings
+        base_rss = private_rss_mb()
+        legacy = np.load(legacy_path)
+        legacy_ms = time_queries(lambda q: cosine_argsort(legacy, q, k), queries)
+        print(f'layout=legacy index=cosine rows={n_rows} ms_per_query={legacy_ms:.3f} private_rss_mb={private_rss_mb() - base_rss:.1f}')
+        expected = [cosine_argsort(legacy, q, k) for q in queries]
+        for dtype in vector_index.EMBEDDING_DTYPES:
+            path = Path(tmp) / f'{dtype}.npy'
+            vector_index.save_embeddings(path, legacy, dtype)
+            for kind in vector_index.INDEX_TYPES:
+                index_path = Path(tmp) / f'{dtype}-{kind}.npz'
+                vector_index.load_or_build_index(vector_index.load_embeddings(path), index_path, kind, normalized=True)
+                base_rss = private_rss_mb()
+                index = vector_index.load_or_build_index(vector_index.load_embeddings(path), index_path, kind, normalized=True)
+                ms = time_queries(lambda q: index.search(q, k), queries)
+                hits = sum((len(np.intersect1d(e, index.search(q, k)[0])) for e, q in zip(expected, queries)))
+                print(f'layout={dtype}-mmap index={kind} rows={n_rows} ms_per_query={ms:.3f} private_rss_mb={private_rss_mb() - base_rss:.1f} file_mb={path.stat().st_size / 1000000.0:.1f} index_mb={index_path.stat().st_size / 1000000.0:.1f} recall={hits / (k * n_queries):.3f} speedup={legacy_ms / ms:.1f}x')
+                del index
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,33 @@
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'secure_result'))
+import db
+
+def run_writers(n_threads: int, writes_per_thread: int) -> float:
+    def worker(i: int):
+        for j in range(writes_per_thread):
+            complaint_id = db.add_complaint(f'student{i}', f'complaint {i}-{j}')
+            db.add_complaint_message(complaint_id, f'student{i}', 'student', 'follow up')
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list(executor.map(worker, range(n_threads)))
+    return time.perf_counter() - start
+
+def main(n_threads: int=16, writes_per_thread: int=200, synchronous: str=dict(db.DB_PRAGMAS)['synchronous']):
+    total = n_threads * writes_per_thread * 2
+    db.DB_PRAGMAS = tuple(((name, synchronous if name == 'synchronous' else value) for name, value in db.DB_PRAGMAS))
+    for queued in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            db.DB_PATH = Path(tmp) / 'bench.sqlite3'
+            db.init_db()
+            if queued:
+                db.start_writer()
+            elapsed = run_writers(n_threads, writes_per_thread)
+            db.stop_writer()
+            db.close_pool()
+        print(f"write_queue={queued} synchronous={synchronous} threads={n_threads} writes={total} seconds={elapsed:.2f} writes_per_sec={total / elapsed:,.0f}")
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]), *sys.argv[3:4])
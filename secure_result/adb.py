@@ -0,0 +1,80 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlite3 import Connection
+from typing import Any, Callable, List, Optional
+import db
+MAX_WORKERS = db.POOL_SIZE
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_thread_conns: List[Connection] = []
+
+def _init_worker():
+    conn = db.get_conn()
+    db._local.conn = conn
+    with _executor_lock:
+        _thread_conns.append(conn)
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='adb', initializer=_init_worker)
+        return _executor
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        executor, _executor = (_executor, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+    with _executor_lock:
+        while _thread_conns:
+            _thread_conns.pop().close()
+
+async def run(func: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+def _mirror(func: Callable[..., Any]) -> Callable[..., Any]:
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run(func, *args, **kwargs)
+    return wrapper
+init_db = _mirror(db.init_db)
+schema_version = _mirror(db.schema_version)
+create_user = _mirror(db.create_user)
+get_user_by_username = _mirror(db.get_user_by_username)
+verify_user = _mirror(db.verify_user)
+authenticate = _mirror(db.authenticate)
+create_session = _mirror(db.create_session)
+get_session_user = _mirror(db.get_session_user)
+delete_session = _mirror(db.delete_session)
+add_complaint = _mirror(db.add_complaint)
+get_complaints_by_student = _mirror(db.get_complaints_by_student)
+get_all_complaints = _mirror(db.get_all_complaints)
+count_complaints = _mirror(db.count_complaints)
+get_complaint_facets = _mirror(db.get_complaint_facets)
+search_complaints = _mirror(db.search_complaints)
+get_dashboard_summary = _mirror(db.get_dashboard_summary)
+get_complaints_page = _mirror(db.get_complaints_page)
+update_complaint_status = _mirror(db.update_complaint_status)
+delete_complaint = _mirror(db.delete_complaint)
+update_complaint_category = _mirror(db.update_complaint_category)
+add_resolution_update = _mirror(db.add_resolution_update)
+get_resolution_updates = _mirror(db.get_resolution_updates)
+add_complaint_message = _mirror(db.add_complaint_message)
+get_complaint_messages = _mirror(db.get_complaint_messages)
+get_threads = _mirror(db.get_threads)
+add_result = _mirror(db.add_result)
+get_results_by_student = _mirror(db.get_results_by_student)
+get_latest_results_for_students = _mirror(db.get_latest_results_for_students)
+import_results_from_dataframe = _mirror(db.import_results_from_dataframe)
+insert_sample_results = _mirror(db.insert_sample_results)
+fix_student_username_commas = _mirror(db.fix_student_username_commas)
+archive_closed_complaints = _mirror(db.archive_closed_complaints)
+get_open_complaints_older_than = _mirror(db.get_open_complaints_older_than)
+count_open_complaints_older_than = _mirror(db.count_open_complaints_older_than)
+count_complaints_between = _mirror(db.count_complaints_between)
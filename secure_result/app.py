@@ -1,4 +1,5 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import warnings
 import os
 import sys
@@ -44,6 +45,8 @@ with redirect_stderr(_stderr_suppress):
     pass
 st.set_option('client.showErrorDetails', True)
 import db
+import model_loader
+SESSION_COOKIE = 'secure_result_session'
 
 def show_header():
     st.markdown('\n\n\n\n        ')
@@ -52,11 +55,44 @@ def require_login():
     return 'username' in st.session_state and st.session_state.get('username')
 
 def do_logout():
-    for k in ['username', 'role']:
+    token = st.session_state.get('session_token')
+    if token:
+        db.delete_session(token)
+        st.session_state['stale_session_token'] = token
+    st.session_state['pending_session_cookie'] = ''
+    for k in ['username', 'role', 'session_token']:
         if k in st.session_state:
             del st.session_state[k]
     st.rerun()
 
+def sync_session_cookie():
+    if 'pending_session_cookie' not in st.session_state:
+        return
+    token = st.session_state.pop('pending_session_cookie')
+    max_age = db.SESSION_TTL_SECONDS if token else 0
+    components.html(f"<script>const secure = window.parent.location.protocol === 'https:' ? '; Secure' : ''; window.parent.document.cookie = '{SESSION_COOKIE}={token}; Path=/; Max-Age={max_age}; SameSite=Strict' + secure;</script>", height=0)
+
+def start_session(user: dict):
+    token = db.create_session(user['username'])
+    st.session_state['username'] = user['username']
+    st.session_state['role'] = user['role']
+    st.session_state['session_token'] = token
+    st.session_state['pending_session_cookie'] = token
+
+def restore_session() -> bool:
+    token = st.context.cookies.get(SESSION_COOKIE)
+    if not token or token == st.session_state.get('stale_session_token'):
+        return False
+    user = db.get_session_user(token)
+    if user is None:
+        st.session_state['stale_session_token'] = token
+        st.session_state['pending_session_cookie'] = ''
+        return False
+    st.session_state['username'] = user['username']
+    st.session_state['role'] = user['role']
+    st.session_state['session_token'] = token
+    return True
+
 def show_login_page():
     st.markdown('\n\n\n    Welcome! Please login or create an account to continue.\n\n    ')
     st.divider()
@@ -70,15 +106,15 @@ def show_login_page():
             if submitted:
                 if not username or not password:
                     st.error('Please enter both username and password.')
-                elif db.verify_user(username, password):
-                    user = db.get_user_by_username(username)
-                    st.session_state['username'] = username
-                    st.session_state['role'] = user['role']
-                    st.success(f'✅ Successfully logged in as **{username}** ({user['role']})')
-                    st.balloons()
-                    st.rerun()
                 else:
-                    st.error('❌ Invalid credentials or user does not exist. Please try again.')
+                    user = db.authenticate(username, password)
+                    if user:
+                        start_session(user)
+                        st.success(f'✅ Successfully logged in as **{username}** ({user['role']})')
+                        st.balloons()
+                        st.rerun()
+                    else:
+                        st.error('❌ Invalid credentials or user does not exist. Please try again.')
     with tab2:
         st.subheader('Create New Account')
         with st.form('signup_form', clear_on_submit=True):
@@ -117,7 +153,9 @@ def show_logout_button():
 
 def main():
     st.set_page_config(page_title='Secure Result', layout='wide')
-    if not require_login():
+    logged_in = require_login() or restore_session()
+    sync_session_cookie()
+    if not logged_in:
         show_login_page()
         st.stop()
     username = st.session_state['username']
@@ -136,6 +174,9 @@ def main():
 if __name__ == '__main__':
     try:
         db.init_db()
+        if db.WRITE_QUEUE_ENABLED:
+            db.start_writer()
     except Exception:
         st.warning('Database initialization failed or already done.')
+    model_loader.start_warmup()
     main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import db
+BACKUP_DIR = db.DB_PATH.parent / 'backups'
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.05
+_backup_lock = threading.Lock()
+_backup_thread: Optional[threading.Thread] = None
+_backup_status: Dict[str, Any] = {'state': 'idle'}
+
+def default_backup_path() -> Path:
+    return BACKUP_DIR / f"db-{datetime.now().strftime('%Y%m%d-%H%M%S')}.sqlite3"
+
+def backup_database(dest: Optional[Path]=None, pages: int=BACKUP_PAGES_PER_STEP, sleep: float=BACKUP_STEP_SLEEP, progress: Optional[Callable[[Dict[str, Any]], None]]=None) -> Dict[str, Any]:
+    if not db.DB_PATH.exists():
+        raise FileNotFoundError(f'Database not found: {db.DB_PATH}')
+    dest = Path(dest) if dest else default_backup_path()
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    partial = dest.with_name(dest.name + '.part')
+    source = sqlite3.connect(str(db.DB_PATH), isolation_level=None)
+    target = sqlite3.connect(str(partial), isolation_level=None)
+    start = time.perf_counter()
+    report = {'dest': str(dest), 'pages_copied': 0, 'pages_total': 0, 'percent': 0.0, 'seconds': 0.0, 'pages_per_sec': 0.0, 'mb_per_sec': 0.0}
+    try:
+        page_size = source.execute('PRAGMA page_size').fetchone()[0]
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+
+        def on_step(status: int, remaining: int, total: int):
+            elapsed = time.perf_counter() - start
+            copied = total - remaining
+            report.update(pages_copied=copied, pages_total=total, percent=round(100.0 * copied / total, 1) if total else 100.0, seconds=round(elapsed, 3), pages_per_sec=round(copied / elapsed, 1) if elapsed else 0.0, mb_per_sec=round(copied * page_size / elapsed / 1000000.0, 2) if elapsed else 0.0)
+            if progress:
+                progress(dict(report))
+            if remaining:
+                time.sleep(sleep)
+        source.backup(target, pages=pages, progress=on_step)
+        source.execute('COMMIT')
+    finally:
+        target.close()
+        source.close()
+    partial.replace(dest)
+    report['seconds'] = round(time.perf_counter() - start, 3)
+    report['bytes'] = dest.stat().st_size
+    return report
+
+def _run_backup_task(dest: Optional[Path], pages: int, sleep: float):
+    try:
+        report = backup_database(dest, pages=pages, sleep=sleep, progress=lambda r: _backup_status.update(r))
+        _backup_status.update(report, state='done', finished_at=datetime.now().isoformat(sep=' ', timespec='seconds'))
+    except Exception as e:
+        _backup_status.update(state='failed', error=str(e))
+
+def start_backup(dest: Optional[Path]=None, pages: int=BACKUP_PAGES_PER_STEP, sleep: float=BACKUP_STEP_SLEEP) -> bool:
+    global _backup_thread
+    with _backup_lock:
+        if _backup_thread is not None and _backup_thread.is_alive():
+            return False
+        _backup_status.clear()
+        _backup_status.update(state='running', started_at=datetime.now().isoformat(sep=' ', timespec='seconds'))
+        _backup_thread = threading.Thread(target=_run_backup_task, args=(dest, pages, sleep), name='db-backup', daemon=True)
+        _backup_thread.start()
+    return True
+
+def backup_status() -> Dict[str, Any]:
+    return dict(_backup_status)
+
+def main(argv: Optional[list]=None) -> int:
+    parser = argparse.ArgumentParser(description='Online backup of the application database.')
+    parser.add_argument('dest', nargs='?', type=Path, help='backup file (default: data/backups/db-<timestamp>.sqlite3)')
+    parser.add_argument('--pages', type=int, default=BACKUP_PAGES_PER_STEP, help='pages copied per step')
+    parser.add_argument('--sleep', type=float, default=BACKUP_STEP_SLEEP, help='seconds to sleep between steps')
+    args = parser.parse_args(argv)
+    report = backup_database(args.dest, pages=args.pages, sleep=args.sleep, progress=lambda r: print(f"\r{r['percent']:5.1f}% {r['pages_copied']}/{r['pages_total']} pages {r['mb_per_sec']:.2f} MB/s", end='', file=sys.stderr))
+    print(file=sys.stderr)
+    print(f"backup={report['dest']} bytes={report['bytes']} seconds={report['seconds']:.2f} mb_per_sec={report['mb_per_sec']:.2f}")
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
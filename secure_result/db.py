@@ -1,20 +1,394 @@
 import sqlite3
 from sqlite3 import Connection
 from pathlib import Path
+import atexit
+import collections
+import csv
+import functools
 import hashlib
+import io
+import re
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable, Union
 DB_PATH = Path(__file__).parent.parent / 'data' / 'db.sqlite3'
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+DB_PRAGMAS = (('journal_mode', 'WAL'), ('synchronous', 'NORMAL'), ('mmap_size', 268435456), ('cache_size', -32000), ('busy_timeout', 5000), ('recursive_triggers', 'ON'))
+POOL_SIZE = 8
+QUERY_STATS_ENABLED = True
+SLOW_QUERY_MS = 100.0
+SLOW_QUERY_LOG_SIZE = 200
+QUERY_STATS_MAX_STATEMENTS = 500
+QUERY_SAMPLE_SIZE = 1000
+ROW_FORMATS = ('dict', 'compact', 'columnar')
+WRITE_QUEUE_ENABLED = False
+WRITE_BATCH_SIZE = 64
+WRITE_BATCH_WINDOW = 0.0005
+IMPORT_CHUNK_SIZE = 5000
+COMPLAINT_PAGE_SIZE = 50
+COMPLAINT_FILTER_COLUMNS = ('status', 'student_username', 'predicted_category', 'course_code', 'semester')
+COMPLAINT_FACET_COLUMNS = ('status', 'predicted_category', 'course_code', 'semester')
+COMPLAINT_SORTS = {'newest': 'DESC', 'oldest': 'ASC'}
+SEARCH_LIMIT = 20
+SQL_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 1000
+COMPLAINT_EXPORT_COLUMNS = (('Complaint ID', 'complaint_id'), ('Student', 'student_username'), ('Course Code', 'course_code'), ('Semester', 'semester'), ('Text', 'text'), ('Category', 'predicted_category'), ('Confidence', 'confidence'), ('Status', 'status'), ('File Path', 'file_path'), ('Created At', 'created_at'))
+FTS_SCHEMA = ("CREATE VIRTUAL TABLE complaints_fts USING fts5(student_username, text, content='complaints', content_rowid='complaint_id', prefix='2 3')", 'CREATE TRIGGER complaints_fts_ai AFTER INSERT ON complaints BEGIN INSERT INTO complaints_fts(rowid, student_username, text) VALUES (new.complaint_id, new.student_username, new.text); END', "CREATE TRIGGER complaints_fts_ad AFTER DELETE ON complaints BEGIN INSERT INTO complaints_fts(complaints_fts, rowid, student_username, text) VALUES ('delete', old.complaint_id, old.student_username, old.text); END", "CREATE TRIGGER complaints_fts_au AFTER UPDATE OF student_username, text ON complaints BEGIN INSERT INTO complaints_fts(complaints_fts, rowid, student_username, text) VALUES ('delete', old.complaint_id, old.student_username, old.text); INSERT INTO complaints_fts(rowid, student_username, text) VALUES (new.complaint_id, new.student_username, new.text); END", "INSERT INTO complaints_fts(complaints_fts) VALUES ('rebuild')", "CREATE VIRTUAL TABLE complaint_messages_fts USING fts5(message_text, content='complaint_messages', content_rowid='message_id', prefix='2 3')", 'CREATE TRIGGER complaint_messages_fts_ai AFTER INSERT ON complaint_messages BEGIN INSERT INTO complaint_messages_fts(rowid, message_text) VALUES (new.message_id, new.message_text); END', "CREATE TRIGGER complaint_messages_fts_ad AFTER DELETE ON complaint_messages BEGIN INSERT INTO complaint_messages_fts(complaint_messages_fts, rowid, message_text) VALUES ('delete', old.message_id, old.message_text); END", "CREATE TRIGGER complaint_messages_fts_au AFTER UPDATE OF message_text ON complaint_messages BEGIN INSERT INTO complaint_messages_fts(complaint_messages_fts, rowid, message_text) VALUES ('delete', old.message_id, old.message_text); INSERT INTO complaint_messages_fts(rowid, message_text) VALUES (new.message_id, new.message_text); END", "INSERT INTO complaint_messages_fts(complaint_messages_fts) VALUES ('rebuild')")
+RESULT_STATUSES = ('Pass', 'Fail', 'Backlog')
+CLOSED_STATUSES = ('Resolved', 'Rejected')
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 1000
+SESSION_TTL_SECONDS = 7 * 86400
+ARCHIVE_TABLES = (('complaints', 'complaints_archive', ('complaint_id', 'student_username', 'text', 'predicted_category', 'confidence', 'status', 'file_path', 'created_at', 'course_code', 'semester', 'duplicate_reference', 'created_epoch')), ('complaint_messages', 'complaint_messages_archive', ('message_id', 'complaint_id', 'sender_username', 'sender_role', 'message_text', 'file_paths', 'created_at')), ('resolution_updates', 'resolution_updates_archive', ('update_id', 'complaint_id', 'admin_username', 'note_text', 'file_paths', 'created_at')))
+RESULT_UPSERT_SQL = "INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_epoch) VALUES (?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER)) ON CONFLICT (student_username, course_code, COALESCE(semester, '')) DO UPDATE SET course_name = excluded.course_name, marks = excluded.marks, status = excluded.status, uploaded_at = CURRENT_TIMESTAMP, uploaded_epoch = excluded.uploaded_epoch WHERE course_name IS NOT excluded.course_name OR marks IS NOT excluded.marks OR status IS NOT excluded.status"
+_pool: 'queue.LifoQueue[Connection]' = queue.LifoQueue(maxsize=POOL_SIZE)
+COUNTER_DIMENSIONS = {'complaints': (('complaints_total', "''", None), ('complaints_by_status', "COALESCE({row}.status, '')", None), ('complaints_by_category', "COALESCE({row}.predicted_category, '')", None), ('complaints_by_course', "COALESCE({row}.course_code, '')", None), ('complaints_by_date', "COALESCE(date({row}.created_at), '')", None), ('duplicates_by_status', "COALESCE({row}.status, '')", '{row}.duplicate_reference IS NOT NULL')), 'results': (('results_total', "''", None), ('results_by_status', "COALESCE({row}.status, '')", None), ('results_by_course', "COALESCE({row}.course_code, '')", None))}
+_local = threading.local()
+_write_queue: 'queue.Queue[Optional[Tuple[Future, Callable[..., Any], tuple, dict]]]' = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_fts_enabled: Optional[bool] = None
+_stats_lock = threading.Lock()
+_query_stats: Dict[str, Dict[str, Any]] = {}
+_slow_queries: 'collections.deque[Dict[str, Any]]' = collections.deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_FULL_SCAN = re.compile('^SCAN (\\S+)( AS \\S+)?$')
+
+@functools.lru_cache(maxsize=1024)
+def _statement_key(sql: str) -> str:
+    return ' '.join(sql.split())
+
+def _stats_entry(key: str) -> Dict[str, Any]:
+    stats = _query_stats.get(key)
+    if stats is None:
+        if len(_query_stats) >= QUERY_STATS_MAX_STATEMENTS:
+            del _query_stats[min(_query_stats, key=lambda k: _query_stats[k]['calls'])]
+        stats = _query_stats[key] = {'calls': 0, 'total_ms': 0.0, 'rows': 0, 'samples': collections.deque(maxlen=QUERY_SAMPLE_SIZE), 'plan': None, 'full_scan': False}
+    return stats
+
+def _record_query(key: str, elapsed: float, rows: int):
+    elapsed_ms = elapsed * 1000.0
+    with _stats_lock:
+        stats = _stats_entry(key)
+        stats['calls'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['rows'] += rows
+        stats['samples'].append(elapsed_ms)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            _slow_queries.append({'sql': key, 'ms': round(elapsed_ms, 3), 'rows': rows, 'thread': threading.current_thread().name, 'at': datetime.now().isoformat(sep=' ', timespec='seconds')})
+
+def _scans_table(conn: sqlite3.Connection, sql: str, plan: List[str]) -> bool:
+    targets = [m.group(1) for m in map(_FULL_SCAN.match, plan) if m]
+    if not targets:
+        return False
+    tables = [row[0] for row in sqlite3.Connection.cursor(conn).execute("SELECT name FROM sqlite_master WHERE type = 'table' UNION ALL SELECT name FROM sqlite_temp_master WHERE type = 'table'")]
+    for target in targets:
+        if target in tables or any((re.search(f'\\b{re.escape(table)}\\s+(?:AS\\s+)?{re.escape(target)}\\b', sql, re.IGNORECASE) for table in tables)):
+            return True
+    return False
+
+def _capture_plan(conn: sqlite3.Connection, key: str, sql: str, params: Any):
+    with _stats_lock:
+        if key in _query_stats and _query_stats[key]['plan'] is not None:
+            return
+    full_scan = False
+    if not key.upper().startswith(('SELECT', 'WITH')):
+        plan = []
+    else:
+        try:
+            plan = [row[3] for row in sqlite3.Connection.cursor(conn).execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()]
+            full_scan = _scans_table(conn, sql, plan)
+        except sqlite3.Error:
+            plan = []
+    with _stats_lock:
+        stats = _stats_entry(key)
+        stats['plan'] = plan
+        stats['full_scan'] = full_scan
+
+class InstrumentedCursor(sqlite3.Cursor):
+
+    def _finish(self):
+        pending = self.__dict__.pop('_pending', None)
+        if pending is not None:
+            _record_query(*pending)
+
+    def _run(self, method: Callable[..., Any], sql: str, params: Any, many: bool):
+        self._finish()
+        key = _statement_key(sql)
+        if not many:
+            _capture_plan(self.connection, key, sql, params)
+        start = time.perf_counter()
+        try:
+            method(self, sql, params)
+        finally:
+            self._pending = [key, time.perf_counter() - start, 0]
+        if self.description is None:
+            self._finish()
+        return self
+
+    def execute(self, sql: str, parameters: Any=()):
+        return self._run(sqlite3.Cursor.execute, sql, parameters, False)
+
+    def executemany(self, sql: str, seq_of_parameters: Any):
+        return self._run(sqlite3.Cursor.executemany, sql, seq_of_parameters, True)
+
+    def _fetch(self, method: Callable[..., Any], *args) -> Any:
+        start = time.perf_counter()
+        result = method(self, *args)
+        pending = self.__dict__.get('_pending')
+        if pending is not None:
+            pending[1] += time.perf_counter() - start
+            return (pending, result)
+        return (None, result)
+
+    def fetchall(self) -> List[Any]:
+        pending, rows = self._fetch(sqlite3.Cursor.fetchall)
+        if pending is not None:
+            pending[2] += len(rows)
+            self._finish()
+        return rows
+
+    def fetchmany(self, size: Optional[int]=None) -> List[Any]:
+        size = self.arraysize if size is None else size
+        pending, rows = self._fetch(sqlite3.Cursor.fetchmany, size)
+        if pending is not None:
+            pending[2] += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+
+    def fetchone(self) -> Any:
+        pending, row = self._fetch(sqlite3.Cursor.fetchone)
+        if pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                pending[2] += 1
+        return row
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Any:
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+class InstrumentedConnection(sqlite3.Connection):
+
+    def cursor(self, factory: type=InstrumentedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any=()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def get_query_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        snapshot = [(key, dict(stats), sorted(stats['samples'])) for key, stats in _query_stats.items()]
+        slow = list(_slow_queries)
+
+    def percentile(samples: List[float], q: float) -> float:
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))], 3) if samples else 0.0
+    statements = [{'sql': key, 'calls': stats['calls'], 'total_ms': round(stats['total_ms'], 3), 'mean_ms': round(stats['total_ms'] / stats['calls'], 3) if stats['calls'] else 0.0, 'p50_ms': percentile(samples, 0.5), 'p95_ms': percentile(samples, 0.95), 'p99_ms': percentile(samples, 0.99), 'rows': stats['rows'], 'full_scan': stats['full_scan'], 'plan': stats['plan'] or []} for key, stats, samples in snapshot if stats['calls']]
+    statements.sort(key=lambda s: s['total_ms'], reverse=True)
+    return {'statements': statements, 'slow_queries': slow[::-1], 'slow_query_ms': SLOW_QUERY_MS}
+
+def reset_query_stats():
+    with _stats_lock:
+        _query_stats.clear()
+        _slow_queries.clear()
 
 def get_conn() -> Connection:
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), isolation_level=None, check_same_thread=False, factory=InstrumentedConnection if QUERY_STATS_ENABLED else sqlite3.Connection)
     conn.row_factory = sqlite3.Row
+    for name, value in DB_PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
     return conn
 
+@contextmanager
+def connection() -> Iterator[Connection]:
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        yield conn
+        return
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = get_conn()
+    _local.conn = conn
+    try:
+        yield conn
+    finally:
+        _local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+@contextmanager
+def transaction() -> Iterator[Connection]:
+    with connection() as conn:
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+def close_pool():
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+@functools.lru_cache(maxsize=None)
+def compact_row_class(columns: Tuple[str, ...]) -> type:
+    # saves memory over dict rows, not time: read attributes in hot loops
+    index = {name: i for i, name in enumerate(columns)}
+
+    def get(self, key, default=None, _lookup=index.get, _item=tuple.__getitem__):
+        i = _lookup(key)
+        return default if i is None else _item(self, i)
+
+    def getitem(self, key):
+        return tuple.__getitem__(self, index[key] if isinstance(key, str) else key)
+
+    def contains(self, key):
+        return key in index
+    base = collections.namedtuple('CompactRow', columns, rename=True)
+    return type('CompactRow', (base,), {'__slots__': (), 'get': get, '__getitem__': getitem, '__contains__': contains, 'keys': lambda self: columns, 'values': lambda self: tuple(self), 'items': lambda self: zip(columns, self), 'to_dict': lambda self: dict(zip(columns, self))})
+
+def _format_rows(columns: Tuple[str, ...], rows: List[tuple], row_format: str) -> Union[List[Any], Dict[str, List[Any]]]:
+    if row_format == 'dict':
+        return [dict(zip(columns, row)) for row in rows]
+    if row_format == 'compact':
+        return list(map(functools.partial(tuple.__new__, compact_row_class(columns)), rows))
+    if row_format == 'columnar':
+        return {column: list(values) for column, values in zip(columns, zip(*rows) if rows else [()] * len(columns))}
+    raise ValueError(f'Unknown row format: {row_format}')
+
+def _fetch_rows(cur: sqlite3.Cursor, row_format: str='dict') -> Union[List[Any], Dict[str, List[Any]]]:
+    cur.row_factory = None
+    return _format_rows(tuple((d[0] for d in cur.description)), cur.fetchall(), row_format)
+
+def start_writer():
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is not None and _writer_thread.is_alive():
+            return
+        _writer_thread = threading.Thread(target=_writer_loop, name='db-writer', daemon=True)
+        _writer_thread.start()
+    atexit.register(stop_writer)
+
+def stop_writer():
+    global _writer_thread
+    with _writer_lock:
+        thread, _writer_thread = (_writer_thread, None)
+    if thread is not None and thread.is_alive():
+        _write_queue.put(None)
+        thread.join()
+
+def writer_running() -> bool:
+    thread = _writer_thread
+    return thread is not None and thread.is_alive()
+
+def submit_write(func: Callable[..., Any], *args, **kwargs) -> Future:
+    future = Future()
+    if writer_running():
+        _write_queue.put((future, func, args, kwargs))
+        return future
+    future.set_running_or_notify_cancel()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def _queued_write(func: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        conn = getattr(_local, 'conn', None)
+        if writer_running() and threading.current_thread() is not _writer_thread and (conn is None or not conn.in_transaction):
+            return submit_write(func, *args, **kwargs).result()
+        return func(*args, **kwargs)
+    return wrapper
+
+def _next_write_batch() -> Tuple[list, bool]:
+    batch = [_write_queue.get()]
+    deadline = time.monotonic() + WRITE_BATCH_WINDOW
+    while batch[-1] is not None and len(batch) < WRITE_BATCH_SIZE:
+        try:
+            batch.append(_write_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+        except queue.Empty:
+            break
+    stop = batch[-1] is None
+    return ([item for item in batch if item is not None], stop)
+
+def _writer_loop():
+    stop = False
+    while not stop:
+        batch, stop = _next_write_batch()
+        batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+        if not batch:
+            continue
+        outcomes = []
+        try:
+            with transaction() as conn:
+                for _, func, args, kwargs in batch:
+                    conn.execute('SAVEPOINT queued_write')
+                    try:
+                        outcomes.append((True, func(*args, **kwargs)))
+                        conn.execute('RELEASE queued_write')
+                    except Exception as e:
+                        conn.execute('ROLLBACK TO queued_write')
+                        conn.execute('RELEASE queued_write')
+                        outcomes.append((False, e))
+        except Exception as e:
+            outcomes = [(False, e)] * len(batch)
+        for (future, _, _, _), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
 def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
+    with connection() as conn:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for target in range(version + 1, len(MIGRATIONS) + 1):
+            with transaction():
+                if conn.execute('PRAGMA user_version').fetchone()[0] >= target:
+                    continue
+                MIGRATIONS[target - 1](conn.cursor())
+                conn.execute(f'PRAGMA user_version = {target}')
+
+def schema_version() -> int:
+    with connection() as conn:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def _migrate_base_schema(cur: sqlite3.Cursor):
     cur.execute("\n\n        CREATE TABLE IF NOT EXISTS users (\n\n            user_id INTEGER PRIMARY KEY AUTOINCREMENT,\n\n            username TEXT UNIQUE NOT NULL,\n\n            password_hash TEXT NOT NULL,\n\n            role TEXT NOT NULL CHECK(role IN ('student','admin')),\n\n            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP\n\n        );\n\n        ")
     cur.execute("\n\n        CREATE TABLE IF NOT EXISTS complaints (\n\n            complaint_id INTEGER PRIMARY KEY AUTOINCREMENT,\n\n            student_username TEXT NOT NULL,\n\n            text TEXT NOT NULL,\n\n            predicted_category TEXT,\n\n            confidence REAL,\n\n            status TEXT NOT NULL DEFAULT 'Pending',\n\n            file_path TEXT,\n\n            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\n\n            FOREIGN KEY(student_username) REFERENCES users(username)\n\n        );\n\n        ")
     cur.execute("\n\n        CREATE TABLE IF NOT EXISTS results (\n\n            result_id INTEGER PRIMARY KEY AUTOINCREMENT,\n\n            student_username TEXT NOT NULL,\n\n            course_code TEXT NOT NULL,\n\n            course_name TEXT,\n\n            semester TEXT,\n\n            marks TEXT,\n\n            status TEXT CHECK(status IN ('Pass','Fail','Backlog')) DEFAULT 'Pass',\n\n            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\n\n            FOREIGN KEY(student_username) REFERENCES users(username)\n\n        );\n\n        ")
@@ -24,245 +398,551 @@ def init_db():
     cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_student ON complaints(student_username);')
     cur.execute('CREATE INDEX IF NOT EXISTS idx_resolution_complaint ON resolution_updates(complaint_id);')
     cur.execute('CREATE INDEX IF NOT EXISTS idx_messages_complaint ON complaint_messages(complaint_id);')
+
+def _migrate_complaint_columns(cur: sqlite3.Cursor):
+    existing = {row[1] for row in cur.execute('PRAGMA table_info(complaints)').fetchall()}
+    for column, column_type in (('file_path', 'TEXT'), ('course_code', 'TEXT'), ('semester', 'TEXT'), ('duplicate_reference', 'INTEGER')):
+        if column not in existing:
+            cur.execute(f'ALTER TABLE complaints ADD COLUMN {column} {column_type};')
+
+def _migrate_complaint_indexes(cur: sqlite3.Cursor):
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_created ON complaints(created_at, complaint_id);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_status_created ON complaints(status, created_at, complaint_id);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_category ON complaints(predicted_category);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_course ON complaints(course_code);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_semester ON complaints(semester);')
+
+def _migrate_result_uniqueness(cur: sqlite3.Cursor):
+    _normalize_result_usernames(cur)
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_results_student_course_semester ON results(student_username, course_code, COALESCE(semester, ''));")
+
+def _counter_statements(table: str, row: str, delta: int) -> List[str]:
+    statements = []
+    for metric, key, condition in COUNTER_DIMENSIONS[table]:
+        key_sql = key.format(row=row)
+        condition_sql = condition.format(row=row) if condition else '1'
+        if delta > 0:
+            statements.append(f"INSERT INTO dashboard_counters (metric, key, count) SELECT '{metric}', {key_sql}, 1 WHERE {condition_sql} ON CONFLICT (metric, key) DO UPDATE SET count = count + 1;")
+        else:
+            statements.append(f"UPDATE dashboard_counters SET count = count - 1 WHERE metric = '{metric}' AND key = {key_sql} AND {condition_sql};")
+    return statements
+
+def _create_counters(cur: sqlite3.Cursor):
+    if cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'dashboard_counters'").fetchone() is not None:
+        return
+    cur.execute('CREATE TABLE dashboard_counters (metric TEXT NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (metric, key)) WITHOUT ROWID;')
+    for table, dimensions in COUNTER_DIMENSIONS.items():
+        columns = ', '.join(sorted({c for _, key, condition in dimensions for c in re.findall('\\{row\\}\\.(\\w+)', key + (condition or ''))}))
+        cur.execute(f"CREATE TRIGGER {table}_counters_ai AFTER INSERT ON {table} BEGIN {' '.join(_counter_statements(table, 'new', 1))} END;")
+        cur.execute(f"CREATE TRIGGER {table}_counters_ad AFTER DELETE ON {table} BEGIN {' '.join(_counter_statements(table, 'old', -1))} END;")
+        cur.execute(f"CREATE TRIGGER {table}_counters_au AFTER UPDATE OF {columns} ON {table} BEGIN {' '.join(_counter_statements(table, 'old', -1) + _counter_statements(table, 'new', 1))} END;")
+        for metric, key, condition in dimensions:
+            cur.execute(f"INSERT INTO dashboard_counters (metric, key, count) SELECT '{metric}', {key.format(row=table)}, COUNT(*) FROM {table} WHERE {(condition.format(row=table) if condition else '1')} GROUP BY 2 HAVING COUNT(*) > 0")
+
+def _create_fts(cur: sqlite3.Cursor):
+    global _fts_enabled
+    if cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'complaint_messages_fts'").fetchone() is not None:
+        _fts_enabled = True
+        return
+    cur.execute('SAVEPOINT create_fts')
     try:
-        cur.execute('ALTER TABLE complaints ADD COLUMN file_path TEXT;')
-    except Exception:
-        pass
-    try:
-        cur.execute('ALTER TABLE complaints ADD COLUMN course_code TEXT;')
-    except Exception:
-        pass
-    try:
-        cur.execute('ALTER TABLE complaints ADD COLUMN semester TEXT;')
-    except Exception:
-        pass
-    try:
-        cur.execute('ALTER TABLE complaints ADD COLUMN duplicate_reference INTEGER;')
-    except Exception:
-        pass
-    conn.commit()
-    conn.close()
+        for statement in FTS_SCHEMA:
+            cur.execute(statement)
+        cur.execute('RELEASE create_fts')
+        _fts_enabled = True
+    except sqlite3.OperationalError:
+        cur.execute('ROLLBACK TO create_fts')
+        cur.execute('RELEASE create_fts')
+        _fts_enabled = False
+
+def _migrate_archive_tables(cur: sqlite3.Cursor):
+    cur.execute("CREATE TABLE IF NOT EXISTS complaints_archive (complaint_id INTEGER PRIMARY KEY, student_username TEXT NOT NULL, text TEXT NOT NULL, predicted_category TEXT, confidence REAL, status TEXT NOT NULL, file_path TEXT, created_at TIMESTAMP, course_code TEXT, semester TEXT, duplicate_reference INTEGER, archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);")
+    cur.execute('CREATE TABLE IF NOT EXISTS complaint_messages_archive (message_id INTEGER PRIMARY KEY, complaint_id INTEGER NOT NULL, sender_username TEXT NOT NULL, sender_role TEXT NOT NULL, message_text TEXT, file_paths TEXT, created_at TIMESTAMP);')
+    cur.execute('CREATE TABLE IF NOT EXISTS resolution_updates_archive (update_id INTEGER PRIMARY KEY, complaint_id INTEGER NOT NULL, admin_username TEXT NOT NULL, note_text TEXT, file_paths TEXT, created_at TIMESTAMP);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_archive_student ON complaints_archive(student_username, created_at);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_messages_archive_complaint ON complaint_messages_archive(complaint_id);')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_resolution_archive_complaint ON resolution_updates_archive(complaint_id);')
+
+def _migrate_epoch_columns(cur: sqlite3.Cursor):
+    for table, text_column, epoch_column, key in (('complaints', 'created_at', 'created_epoch', 'complaint_id'), ('results', 'uploaded_at', 'uploaded_epoch', 'result_id')):
+        if epoch_column not in {row[1] for row in cur.execute(f'PRAGMA table_info({table})').fetchall()}:
+            cur.execute(f'ALTER TABLE {table} ADD COLUMN {epoch_column} INTEGER;')
+        cur.execute(f"UPDATE {table} SET {epoch_column} = CAST(strftime('%s', {text_column}) AS INTEGER) WHERE {epoch_column} IS NULL;")
+        cur.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_epoch_ai AFTER INSERT ON {table} WHEN new.{epoch_column} IS NULL BEGIN UPDATE {table} SET {epoch_column} = CAST(strftime('%s', new.{text_column}) AS INTEGER) WHERE {key} = new.{key}; END;")
+        cur.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_epoch_au AFTER UPDATE OF {text_column} ON {table} BEGIN UPDATE {table} SET {epoch_column} = CAST(strftime('%s', new.{text_column}) AS INTEGER) WHERE {key} = new.{key} AND {epoch_column} IS NOT CAST(strftime('%s', new.{text_column}) AS INTEGER); END;")
+    if 'created_epoch' not in {row[1] for row in cur.execute('PRAGMA table_info(complaints_archive)').fetchall()}:
+        cur.execute('ALTER TABLE complaints_archive ADD COLUMN created_epoch INTEGER;')
+        cur.execute("UPDATE complaints_archive SET created_epoch = CAST(strftime('%s', created_at) AS INTEGER);")
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_complaints_created_epoch ON complaints(created_epoch);')
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_complaints_open_epoch ON complaints(created_epoch) WHERE status NOT IN ({', '.join((repr(s) for s in CLOSED_STATUSES))});")
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_results_uploaded_epoch ON results(uploaded_epoch);')
+
+def _migrate_sessions(cur: sqlite3.Cursor):
+    cur.execute('CREATE TABLE IF NOT EXISTS sessions (token_hash TEXT PRIMARY KEY, username TEXT NOT NULL, created_epoch INTEGER NOT NULL, expires_epoch INTEGER NOT NULL, FOREIGN KEY(username) REFERENCES users(username)) WITHOUT ROWID;')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_epoch);')
+
+def _migrate_archive_counters(cur: sqlite3.Cursor):
+    cur.execute(f"CREATE TRIGGER IF NOT EXISTS complaints_archive_counters_ai AFTER INSERT ON complaints_archive BEGIN {' '.join(_counter_statements('complaints', 'new', 1))} END;")
+    cur.execute(f"CREATE TRIGGER IF NOT EXISTS complaints_archive_counters_ad AFTER DELETE ON complaints_archive BEGIN {' '.join(_counter_statements('complaints', 'old', -1))} END;")
+    for metric, key, condition in COUNTER_DIMENSIONS['complaints']:
+        cur.execute(f"INSERT INTO dashboard_counters (metric, key, count) SELECT '{metric}', {key.format(row='complaints_archive')}, COUNT(*) FROM complaints_archive WHERE {(condition.format(row='complaints_archive') if condition else '1')} GROUP BY 2 HAVING COUNT(*) > 0 ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count")
+
+MIGRATIONS = (_migrate_base_schema, _migrate_complaint_columns, _migrate_complaint_indexes, _migrate_result_uniqueness, _create_fts, _create_counters, _migrate_archive_tables, _migrate_epoch_columns, _migrate_sessions, _migrate_archive_counters)
+
+def fts_enabled() -> bool:
+    global _fts_enabled
+    if _fts_enabled is None:
+        with connection() as conn:
+            _fts_enabled = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'complaint_messages_fts'").fetchone() is not None
+    return _fts_enabled
+
+def fts_query(text: str) -> str:
+    return ' '.join((f'"{token}"*' for token in re.findall('\\w+', text or '')))
+
+def _normalize_result_usernames(cur: sqlite3.Cursor) -> int:
+    cur.execute("DELETE FROM results WHERE result_id IN (SELECT result_id FROM (SELECT result_id, ROW_NUMBER() OVER (PARTITION BY TRIM(REPLACE(student_username, ',', '')), course_code, COALESCE(semester, '') ORDER BY uploaded_at DESC, result_id DESC) AS rn FROM results) WHERE rn > 1)")
+    cur.execute("UPDATE results SET student_username = TRIM(REPLACE(student_username, ',', '')) WHERE student_username <> TRIM(REPLACE(student_username, ',', ''))")
+    return cur.rowcount
+
+def normalize_username(username: Any) -> str:
+    return str(username).replace(',', '').strip()
 
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode('utf-8')).hexdigest()
 
+@_queued_write
 def create_user(username: str, password: str, role: str='student') -> bool:
-    conn = get_conn()
     try:
-        conn.execute('INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)', (username, hash_password(password), role))
-        conn.commit()
+        with transaction() as conn:
+            conn.execute('INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)', (username, hash_password(password), role))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
-    conn = get_conn()
-    cur = conn.execute('SELECT user_id, username, role, created_at FROM users WHERE username = ?', (username,))
-    row = cur.fetchone()
-    conn.close()
+    with connection() as conn:
+        row = conn.execute('SELECT user_id, username, role, created_at FROM users WHERE username = ?', (username,)).fetchone()
     return dict(row) if row else None
 
 def verify_user(username: str, password: str) -> bool:
-    conn = get_conn()
-    cur = conn.execute('SELECT password_hash FROM users WHERE username = ?', (username,))
-    row = cur.fetchone()
-    conn.close()
-    if not row:
-        return False
-    return hash_password(password) == row['password_hash']
+    return authenticate(username, password) is not None
+
+def authenticate(username: str, password: str) -> Optional[Dict[str, Any]]:
+    with connection() as conn:
+        row = conn.execute('SELECT user_id, username, role, created_at, password_hash FROM users WHERE username = ?', (username,)).fetchone()
+    if not row or not secrets.compare_digest(hash_password(password), row['password_hash']):
+        return None
+    user = dict(row)
+    del user['password_hash']
+    return user
 
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+@_queued_write
+def create_session(username: str, ttl_seconds: int=SESSION_TTL_SECONDS) -> str:
+    token = secrets.token_urlsafe(32)
+    now = int(time.time())
+    with transaction() as conn:
+        conn.execute('DELETE FROM sessions WHERE expires_epoch <= ?', (now,))
+        conn.execute('INSERT INTO sessions (token_hash, username, created_epoch, expires_epoch) VALUES (?, ?, ?, ?)', (_token_hash(token), username, now, now + ttl_seconds))
+    return token
+
+def get_session_user(token: str) -> Optional[Dict[str, Any]]:
+    if not token:
+        return None
+    with connection() as conn:
+        row = conn.execute('SELECT u.user_id, u.username, u.role, u.created_at FROM sessions s JOIN users u ON u.username = s.username WHERE s.token_hash = ? AND s.expires_epoch > ?', (_token_hash(token), int(time.time()))).fetchone()
+    return dict(row) if row else None
+
+@_queued_write
+def delete_session(token: str):
+    with transaction() as conn:
+        conn.execute('DELETE FROM sessions WHERE token_hash = ?', (_token_hash(token),))
+
+@_queued_write
 def add_complaint(student_username: str, text: str, predicted_category: Optional[str]=None, confidence: Optional[float]=None, file_path: Optional[str]=None, course_code: Optional[str]=None, semester: Optional[str]=None, duplicate_reference: Optional[int]=None) -> int:
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute('INSERT INTO complaints (student_username, text, predicted_category, confidence, file_path, course_code, semester, duplicate_reference) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (student_username, text, predicted_category, confidence, file_path, course_code, semester, duplicate_reference))
-    complaint_id = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return complaint_id
-
-def get_complaints_by_student(student_username: str) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    cur = conn.execute('SELECT * FROM complaints WHERE student_username = ? ORDER BY created_at DESC', (student_username,))
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
-
-def get_all_complaints(limit: int=100) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    cur = conn.execute('SELECT * FROM complaints ORDER BY created_at DESC LIMIT ?', (limit,))
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    with transaction() as conn:
+        cur = conn.execute("INSERT INTO complaints (student_username, text, predicted_category, confidence, file_path, course_code, semester, duplicate_reference, created_epoch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))", (student_username, text, predicted_category, confidence, file_path, course_code, semester, duplicate_reference))
+        return cur.lastrowid
+
+def get_complaints_by_student(student_username: str, include_archived: bool=False, row_format: str='dict') -> List[Dict[str, Any]]:
+    with connection() as conn:
+        if include_archived:
+            columns = ', '.join(ARCHIVE_TABLES[0][2])
+            cur = conn.execute(f'SELECT {columns}, 0 AS archived FROM complaints WHERE student_username = ? UNION ALL SELECT {columns}, 1 AS archived FROM complaints_archive WHERE student_username = ? ORDER BY created_at DESC', (student_username, student_username))
+        else:
+            cur = conn.execute('SELECT * FROM complaints WHERE student_username = ? ORDER BY created_at DESC', (student_username,))
+        return _fetch_rows(cur, row_format)
+
+def get_all_complaints(limit: int=100, row_format: str='dict') -> List[Dict[str, Any]]:
+    with connection() as conn:
+        cur = conn.execute('SELECT * FROM complaints ORDER BY created_at DESC, complaint_id DESC LIMIT ?', (limit,))
+        return _fetch_rows(cur, row_format)
+
+def _like_pattern(text: str) -> str:
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
 
+def _complaint_filter_sql(filters: Optional[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+    clauses = []
+    params = []
+    for column in COMPLAINT_FILTER_COLUMNS:
+        value = (filters or {}).get(column)
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})" if values else '0')
+            params.extend(values)
+        else:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    for column, values in (filters or {}).get('exclude', {}).items():
+        if column not in COMPLAINT_FILTER_COLUMNS:
+            raise ValueError(f'Unknown complaint filter column: {column}')
+        values = list(values)
+        if values:
+            clauses.append(f"({column} IS NULL OR {column} NOT IN ({', '.join('?' * len(values))}))")
+            params.extend(values)
+    search = (filters or {}).get('search')
+    if search and fts_enabled() and fts_query(search):
+        clauses.append('complaint_id IN (SELECT rowid FROM complaints_fts WHERE complaints_fts MATCH ?)')
+        params.append(fts_query(search))
+    elif search:
+        pattern = _like_pattern(search)
+        clauses.append("(student_username LIKE ? ESCAPE '\\' OR text LIKE ? ESCAPE '\\')")
+        params.extend([pattern, pattern])
+    return (clauses, params)
+
+def build_complaint_query(filters: Optional[Dict[str, Any]]=None, sort: str='newest', cursor: Optional[Tuple[str, int]]=None, limit: Optional[int]=None) -> Tuple[str, List[Any]]:
+    if sort not in COMPLAINT_SORTS:
+        raise ValueError(f'Unknown complaint sort: {sort}')
+    direction = COMPLAINT_SORTS[sort]
+    clauses, params = _complaint_filter_sql(filters)
+    if cursor is not None:
+        clauses.append(f"(created_at, complaint_id) {('<' if direction == 'DESC' else '>')} (?, ?)")
+        params.extend(cursor)
+    sql = 'SELECT * FROM complaints'
+    if clauses:
+        sql += f" WHERE {' AND '.join(clauses)}"
+    sql += f' ORDER BY created_at {direction}, complaint_id {direction}'
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    return (sql, params)
+
+def count_complaints(filters: Optional[Dict[str, Any]]=None) -> int:
+    clauses, params = _complaint_filter_sql(filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    with connection() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM complaints {where}', params).fetchone()[0]
+
+def get_complaint_facets(columns: Tuple[str, ...]=COMPLAINT_FACET_COLUMNS) -> Dict[str, List[Any]]:
+    facets = {}
+    with connection() as conn:
+        for column in columns:
+            if column not in COMPLAINT_FACET_COLUMNS:
+                raise ValueError(f'Unknown complaint facet column: {column}')
+            cur = conn.execute(f"WITH RECURSIVE facet(value) AS (SELECT MIN({column}) FROM complaints WHERE {column} > '' UNION ALL SELECT (SELECT MIN({column}) FROM complaints WHERE {column} > facet.value) FROM facet WHERE facet.value IS NOT NULL) SELECT value FROM facet WHERE value IS NOT NULL")
+            facets[column] = [r[0] for r in cur.fetchall()]
+    return facets
+
+def search_complaints(query: str, limit: int=SEARCH_LIMIT, include_archived: bool=False) -> List[Dict[str, Any]]:
+    match = fts_query(query)
+    if not match or not fts_enabled():
+        return []
+    with connection() as conn:
+        complaint_hits = conn.execute("SELECT c.complaint_id, c.student_username, c.status, c.created_at, 'complaint' AS source, NULL AS message_id, snippet(complaints_fts, -1, '**', '**', '…', 16) AS snippet, bm25(complaints_fts) AS score, 0 AS archived FROM complaints_fts JOIN complaints c ON c.complaint_id = complaints_fts.rowid WHERE complaints_fts MATCH ? ORDER BY score LIMIT ?", (match, limit)).fetchall()
+        message_hits = conn.execute("SELECT c.complaint_id, c.student_username, c.status, m.created_at, 'message' AS source, m.message_id, snippet(complaint_messages_fts, 0, '**', '**', '…', 16) AS snippet, bm25(complaint_messages_fts) AS score, 0 AS archived FROM complaint_messages_fts JOIN complaint_messages m ON m.message_id = complaint_messages_fts.rowid JOIN complaints c ON c.complaint_id = m.complaint_id WHERE complaint_messages_fts MATCH ? ORDER BY score LIMIT ?", (match, limit)).fetchall()
+        if include_archived:
+            complaint_hits += _search_archive(conn, query, limit)
+    hits = sorted((dict(r) for r in complaint_hits + message_hits), key=lambda hit: hit['score'])
+    return hits[:limit]
+
+def _search_archive(conn: Connection, query: str, limit: int) -> List[sqlite3.Row]:
+    tokens = re.findall('\\w+', query or '')
+    if not tokens:
+        return []
+    patterns = [_like_pattern(token) for token in tokens]
+    complaint_where = ' AND '.join(["(text LIKE ? ESCAPE '\\' OR student_username LIKE ? ESCAPE '\\')"] * len(tokens))
+    message_where = ' AND '.join(["m.message_text LIKE ? ESCAPE '\\'"] * len(tokens))
+    complaint_hits = conn.execute(f"SELECT complaint_id, student_username, status, created_at, 'complaint' AS source, NULL AS message_id, substr(text, max(instr(lower(text), lower(?)) - 40, 1), 120) AS snippet, 0.0 AS score, 1 AS archived FROM complaints_archive WHERE {complaint_where} ORDER BY created_at DESC LIMIT ?", (tokens[0], *(p for pattern in patterns for p in (pattern, pattern)), limit)).fetchall()
+    message_hits = conn.execute(f"SELECT c.complaint_id, c.student_username, c.status, m.created_at, 'message' AS source, m.message_id, substr(m.message_text, max(instr(lower(m.message_text), lower(?)) - 40, 1), 120) AS snippet, 0.0 AS score, 1 AS archived FROM complaint_messages_archive m JOIN complaints_archive c ON c.complaint_id = m.complaint_id WHERE {message_where} ORDER BY m.created_at DESC LIMIT ?", (tokens[0], *patterns, limit)).fetchall()
+    return complaint_hits + message_hits
+
+def get_dashboard_summary() -> Dict[str, Any]:
+    summary = {metric: {} for dimensions in COUNTER_DIMENSIONS.values() for metric, _, _ in dimensions}
+    with connection() as conn:
+        for row in conn.execute('SELECT metric, key, count FROM dashboard_counters WHERE count > 0'):
+            summary.setdefault(row['metric'], {})[row['key']] = row['count']
+    for metric in ('complaints_total', 'results_total'):
+        summary[metric] = summary[metric].get('', 0)
+    return summary
+
+def get_complaints_page(cursor: Optional[Tuple[str, int]]=None, page_size: int=COMPLAINT_PAGE_SIZE, filters: Optional[Dict[str, Any]]=None, sort: str='newest', row_format: str='dict') -> Dict[str, Any]:
+    sql, params = build_complaint_query(filters, sort=sort, cursor=cursor, limit=page_size + 1)
+    with connection() as conn:
+        cur = conn.execute(sql, params)
+        cur.row_factory = None
+        rows = cur.fetchall()
+        columns = tuple((d[0] for d in cur.description))
+    last = dict(zip(columns, rows[page_size - 1])) if len(rows) > page_size else None
+    next_cursor = (last['created_at'], last['complaint_id']) if last else None
+    return {'items': _format_rows(columns, rows[:page_size], row_format), 'next_cursor': next_cursor}
+
+def _timestamp_param(value: Union[str, date, datetime]) -> str:
+    return value.isoformat(sep=' ') if isinstance(value, datetime) else str(value)
+
+def iter_complaints_csv(since: Optional[Union[str, date, datetime]]=None, until: Optional[Union[str, date, datetime]]=None, columns: Tuple[Tuple[str, str], ...]=COMPLAINT_EXPORT_COLUMNS, formatters: Optional[Dict[str, Callable[[Any], Any]]]=None, chunk_size: int=EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    names = [column for _, column in columns]
+    formatters = formatters or {}
+    clauses, params = ([], [])
+    if since is not None:
+        clauses.append('created_at >= ?')
+        params.append(_timestamp_param(since))
+    if until is not None:
+        clauses.append('created_at < ?')
+        params.append(_timestamp_param(until))
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow([header for header, _ in columns])
+    yield buffer.getvalue().encode('utf-8')
+    with connection() as conn:
+        unknown = set(names) - {row[1] for row in conn.execute('PRAGMA table_info(complaints)')}
+        if unknown:
+            raise ValueError(f'Unknown complaint columns: {sorted(unknown)}')
+        cur = conn.execute(f"SELECT {', '.join(names)} FROM complaints{where} ORDER BY created_at DESC, complaint_id DESC", params)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                writer.writerow([formatters[name](value) if name in formatters else value for name, value in zip(names, row)])
+            yield buffer.getvalue().encode('utf-8')
+
+def _epoch_param(value: Union[int, float, str, date, datetime]) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def get_open_complaints_older_than(days: float, row_format: str='dict') -> List[Dict[str, Any]]:
+    cutoff = int(time.time() - days * 86400)
+    with connection() as conn:
+        cur = conn.execute(f"SELECT * FROM complaints WHERE status NOT IN ({', '.join((repr(s) for s in CLOSED_STATUSES))}) AND created_epoch < ? ORDER BY created_epoch ASC, complaint_id ASC", (cutoff,))
+        return _fetch_rows(cur, row_format)
+
+def count_open_complaints_older_than(days: float) -> int:
+    cutoff = int(time.time() - days * 86400)
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM complaints WHERE status NOT IN ({', '.join((repr(s) for s in CLOSED_STATUSES))}) AND created_epoch < ?", (cutoff,)).fetchone()[0]
+
+def count_complaints_between(t0: Union[int, float, str, date, datetime], t1: Union[int, float, str, date, datetime]) -> int:
+    with connection() as conn:
+        return conn.execute('SELECT COUNT(*) FROM complaints WHERE created_epoch >= ? AND created_epoch < ?', (_epoch_param(t0), _epoch_param(t1))).fetchone()[0]
+
+@_queued_write
 def update_complaint_status(complaint_id: int, status: str):
-    conn = get_conn()
-    conn.execute('UPDATE complaints SET status = ? WHERE complaint_id = ?', (status, complaint_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute('UPDATE complaints SET status = ? WHERE complaint_id = ?', (status, complaint_id))
 
-def delete_complaint(complaint_id: int) -> bool:
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
+@_queued_write
+def _delete_complaint_rows(complaint_id: int) -> bool:
+    with transaction() as conn:
+        cur = conn.cursor()
         cur.execute('DELETE FROM complaint_messages WHERE complaint_id = ?', (complaint_id,))
         cur.execute('DELETE FROM resolution_updates WHERE complaint_id = ?', (complaint_id,))
         cur.execute('DELETE FROM complaints WHERE complaint_id = ?', (complaint_id,))
-        conn.commit()
         return cur.rowcount > 0
-    except Exception as e:
-        conn.rollback()
+
+def delete_complaint(complaint_id: int) -> bool:
+    try:
+        return _delete_complaint_rows(complaint_id)
+    except Exception:
+        conn = getattr(_local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            raise
         return False
-    finally:
-        conn.close()
 
+@_queued_write
 def update_complaint_category(complaint_id: int, category: str, confidence: Optional[float]=None):
-    conn = get_conn()
-    if confidence is not None:
-        conn.execute('UPDATE complaints SET predicted_category = ?, confidence = ? WHERE complaint_id = ?', (category, confidence, complaint_id))
-    else:
-        conn.execute('UPDATE complaints SET predicted_category = ? WHERE complaint_id = ?', (category, complaint_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        if confidence is not None:
+            conn.execute('UPDATE complaints SET predicted_category = ?, confidence = ? WHERE complaint_id = ?', (category, confidence, complaint_id))
+        else:
+            conn.execute('UPDATE complaints SET predicted_category = ? WHERE complaint_id = ?', (category, complaint_id))
 
+@_queued_write
 def add_resolution_update(complaint_id: int, admin_username: str, note_text: Optional[str]=None, file_paths: Optional[str]=None) -> int:
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute('INSERT INTO resolution_updates (complaint_id, admin_username, note_text, file_paths) VALUES (?, ?, ?, ?)', (complaint_id, admin_username, note_text, file_paths))
-    update_id = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return update_id
-
-def get_resolution_updates(complaint_id: int) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    cur = conn.execute('SELECT * FROM resolution_updates WHERE complaint_id = ? ORDER BY created_at DESC', (complaint_id,))
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    with transaction() as conn:
+        cur = conn.execute('INSERT INTO resolution_updates (complaint_id, admin_username, note_text, file_paths) VALUES (?, ?, ?, ?)', (complaint_id, admin_username, note_text, file_paths))
+        return cur.lastrowid
+
+def get_resolution_updates(complaint_id: int, row_format: str='dict') -> List[Dict[str, Any]]:
+    with connection() as conn:
+        cur = conn.execute('SELECT * FROM resolution_updates WHERE complaint_id = ? ORDER BY created_at DESC', (complaint_id,))
+        return _fetch_rows(cur, row_format)
 
+@_queued_write
 def add_complaint_message(complaint_id: int, sender_username: str, sender_role: str, message_text: Optional[str]=None, file_paths: Optional[str]=None) -> int:
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute('INSERT INTO complaint_messages (complaint_id, sender_username, sender_role, message_text, file_paths) VALUES (?, ?, ?, ?, ?)', (complaint_id, sender_username, sender_role, message_text, file_paths))
-    message_id = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return message_id
-
-def get_complaint_messages(complaint_id: int) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    cur = conn.execute('SELECT * FROM complaint_messages WHERE complaint_id = ? ORDER BY created_at ASC', (complaint_id,))
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    with transaction() as conn:
+        cur = conn.execute('INSERT INTO complaint_messages (complaint_id, sender_username, sender_role, message_text, file_paths) VALUES (?, ?, ?, ?, ?)', (complaint_id, sender_username, sender_role, message_text, file_paths))
+        return cur.lastrowid
 
+def get_complaint_messages(complaint_id: int, row_format: str='dict') -> List[Dict[str, Any]]:
+    with connection() as conn:
+        cur = conn.execute('SELECT * FROM complaint_messages WHERE complaint_id = ? ORDER BY created_at ASC', (complaint_id,))
+        return _fetch_rows(cur, row_format)
+
+def get_threads(complaint_ids: List[int], include_archived: bool=False) -> Dict[int, Dict[str, List[Dict[str, Any]]]]:
+    ids = list(dict.fromkeys(complaint_ids))
+    threads = {complaint_id: {'messages': [], 'updates': []} for complaint_id in ids}
+    tables = {'messages': ('complaint_messages', 'ORDER BY created_at ASC, message_id ASC'), 'updates': ('resolution_updates', 'ORDER BY created_at DESC, update_id DESC')}
+    archived = {live: (archive, ', '.join(columns)) for live, archive, columns in ARCHIVE_TABLES}
+    with connection() as conn:
+        for start in range(0, len(ids), SQL_BATCH_SIZE):
+            batch = ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ', '.join('?' * len(batch))
+            for key, (table, order) in tables.items():
+                if include_archived:
+                    archive, columns = archived[table]
+                    sql = f'SELECT {columns} FROM {table} WHERE complaint_id IN ({placeholders}) UNION ALL SELECT {columns} FROM {archive} WHERE complaint_id IN ({placeholders}) {order}'
+                    params = batch + batch
+                else:
+                    sql = f'SELECT * FROM {table} WHERE complaint_id IN ({placeholders}) {order}'
+                    params = batch
+                for r in conn.execute(sql, params):
+                    threads[r['complaint_id']][key].append(dict(r))
+    return threads
+
+@_queued_write
+def _archive_batch(older_than_days: int, batch_size: int) -> Tuple[Dict[str, int], int]:
+    moved = {live: 0 for live, _, _ in ARCHIVE_TABLES}
+    statuses = ', '.join('?' * len(CLOSED_STATUSES))
+    with transaction() as conn:
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS archive_batch (complaint_id INTEGER PRIMARY KEY)')
+        conn.execute('DELETE FROM temp.archive_batch')
+        selected = conn.execute(f"INSERT INTO temp.archive_batch SELECT complaint_id FROM complaints WHERE status IN ({statuses}) AND created_at < datetime('now', ?) ORDER BY complaint_id LIMIT ?", (*CLOSED_STATUSES, f'-{int(older_than_days)} days', batch_size)).rowcount
+        if selected:
+            for live, archive, columns in reversed(ARCHIVE_TABLES):
+                column_list = ', '.join(columns)
+                moved[live] = conn.execute(f'INSERT OR REPLACE INTO {archive} ({column_list}) SELECT {column_list} FROM {live} WHERE complaint_id IN (SELECT complaint_id FROM temp.archive_batch)').rowcount
+                conn.execute(f'DELETE FROM {live} WHERE complaint_id IN (SELECT complaint_id FROM temp.archive_batch)')
+    return (moved, selected)
+
+def archive_closed_complaints(older_than_days: int=ARCHIVE_AFTER_DAYS, batch_size: int=ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    if older_than_days < 0:
+        raise ValueError(f'older_than_days must be non-negative, got {older_than_days}')
+    moved = {live: 0 for live, _, _ in ARCHIVE_TABLES}
+    while True:
+        batch_moved, selected = _archive_batch(older_than_days, batch_size)
+        for live, count in batch_moved.items():
+            moved[live] += count
+        if selected < batch_size:
+            break
+    return moved
+
+@_queued_write
 def add_result(student_username: str, course_code: str, course_name: Optional[str], semester: Optional[str], marks: str, status: str='Pass'):
-    conn = get_conn()
-    conn.execute('INSERT INTO results (student_username, course_code, course_name, semester, marks, status) VALUES (?, ?, ?, ?, ?, ?)', (student_username, course_code, course_name, semester, marks, status))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute(RESULT_UPSERT_SQL, (normalize_username(student_username), course_code, course_name, semester, marks, status))
 
-def get_results_by_student(student_username: str) -> List[Dict[str, Any]]:
-    conn = get_conn()
-    conn.row_factory = sqlite3.Row
-    cleaned_username = str(student_username).replace(',', '').strip()
-    cur = conn.execute('SELECT * FROM results WHERE student_username = ? ORDER BY uploaded_at DESC', (cleaned_username,))
-    rows = cur.fetchall()
-    if not rows:
-        cur = conn.execute("SELECT * FROM results WHERE TRIM(REPLACE(student_username, ',', '')) = ? ORDER BY uploaded_at DESC", (cleaned_username,))
-        rows = cur.fetchall()
-    result = [dict(r) for r in rows]
-    conn.close()
-    return result
+def get_results_by_student(student_username: str, row_format: str='dict') -> List[Dict[str, Any]]:
+    with connection() as conn:
+        cur = conn.execute('SELECT * FROM results WHERE student_username = ? ORDER BY uploaded_at DESC', (normalize_username(student_username),))
+        return _fetch_rows(cur, row_format)
+
+def get_latest_results_for_students(usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+    by_normalized = {}
+    for username in usernames:
+        by_normalized.setdefault(normalize_username(username), []).append(username)
+    keys = list(by_normalized)
+    latest = {}
+    with connection() as conn:
+        for start in range(0, len(keys), SQL_BATCH_SIZE):
+            batch = keys[start:start + SQL_BATCH_SIZE]
+            cur = conn.execute(f"SELECT * FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY student_username ORDER BY uploaded_at DESC, result_id DESC) AS rn FROM results WHERE student_username IN ({', '.join('?' * len(batch))})) WHERE rn = 1", batch)
+            for r in cur.fetchall():
+                row = dict(r)
+                del row['rn']
+                for username in by_normalized[row['student_username']]:
+                    latest[username] = row
+    return latest
 
-def import_results_from_dataframe(df: pd.DataFrame) -> Dict[str, int]:
+def _clean_results_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def text(col: str, default: Optional[str]) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series(default, index=df.index, dtype=object)
+        raw = df[col]
+        out = raw.astype(str).str.strip().astype(object)
+        out[raw.isna()] = default
+        return out
+    clean = pd.DataFrame({'student_username': text('student_username', '').str.replace(',', '', regex=False).str.strip(), 'course_code': text('course_code', ''), 'course_name': text('course_name', None), 'semester': text('semester', None), 'marks': text('marks', ''), 'status': text('status', 'Pass')}, index=df.index)
+    checks = [(clean['student_username'] == '', 'Empty student_username'), (clean['course_code'] == '', 'Empty course_code'), (~clean['status'].isin(RESULT_STATUSES), 'Invalid status')]
+    error_frames = []
+    bad = pd.Series(False, index=df.index)
+    for mask, message in checks:
+        mask = mask & ~bad
+        if mask.any():
+            error_frames.append(pd.DataFrame({'row': clean.index[mask], 'error': message}))
+            bad |= mask
+    error_rows = pd.concat(error_frames, ignore_index=True) if error_frames else pd.DataFrame({'row': pd.Series(dtype=object), 'error': pd.Series(dtype=object)})
+    return (clean[~bad], error_rows)
+
+@_queued_write
+def import_results_from_dataframe(df: pd.DataFrame, chunk_size: int=IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
     required = {'student_username', 'course_code'}
     if not required.issubset(set(df.columns)):
         raise ValueError(f'CSV must contain columns: {required}')
-    conn = get_conn()
-    inserted = 0
-    errors = []
-    try:
-        for idx, row in df.iterrows():
+    clean, error_rows = _clean_results_frame(df)
+    processed = 0
+    changed = 0
+    row_errors = []
+    with transaction() as conn:
+        last_id = conn.execute('SELECT COALESCE(MAX(result_id), 0) FROM results').fetchone()[0]
+        for start in range(0, len(clean), chunk_size):
+            chunk = clean.iloc[start:start + chunk_size]
+            params = list(chunk.itertuples(index=False, name=None))
+            conn.execute('SAVEPOINT import_chunk')
             try:
-                student_username = str(row.get('student_username')).replace(',', '').strip()
-                if not student_username:
-                    errors.append(f'Row {idx}: Empty student_username')
-                    continue
-                course_code = str(row.get('course_code'))
-                if not course_code:
-                    errors.append(f'Row {idx}: Empty course_code')
-                    continue
-                course_name = row.get('course_name', None)
-                if pd.isna(course_name):
-                    course_name = None
-                else:
-                    course_name = str(course_name)
-                semester = row.get('semester', None)
-                if pd.isna(semester):
-                    semester = None
-                else:
-                    semester = str(semester)
-                marks = str(row.get('marks', '')) if not pd.isna(row.get('marks')) else ''
-                status = str(row.get('status', 'Pass')) if not pd.isna(row.get('status')) else 'Pass'
-                conn.execute('INSERT INTO results (student_username, course_code, course_name, semester, marks, status) VALUES (?, ?, ?, ?, ?, ?)', (student_username, course_code, course_name, semester, marks, status))
-                inserted += 1
-            except Exception as e:
-                errors.append(f'Row {idx}: {str(e)}')
+                changed += conn.executemany(RESULT_UPSERT_SQL, params).rowcount
+                conn.execute('RELEASE import_chunk')
+                processed += len(params)
                 continue
-        conn.commit()
-        if errors:
-            import sys
-            print(f'Import completed with {len(errors)} errors:', file=sys.stderr)
-            for err in errors[:10]:
-                print(f'  {err}', file=sys.stderr)
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
-    return {'inserted': inserted, 'errors': len(errors)}
+            except sqlite3.DatabaseError:
+                conn.execute('ROLLBACK TO import_chunk')
+                conn.execute('RELEASE import_chunk')
+            for idx, row in zip(chunk.index, params):
+                try:
+                    changed += conn.execute(RESULT_UPSERT_SQL, row).rowcount
+                    processed += 1
+                except sqlite3.DatabaseError as e:
+                    row_errors.append({'row': idx, 'error': str(e)})
+        inserted = conn.execute('SELECT COUNT(*) FROM results WHERE result_id > ?', (last_id,)).fetchone()[0]
+    if row_errors:
+        error_rows = pd.concat([error_rows, pd.DataFrame(row_errors)], ignore_index=True)
+    return {'inserted': inserted, 'updated': changed - inserted, 'unchanged': processed - changed, 'errors': len(error_rows), 'error_rows': error_rows}
 
+@_queued_write
 def insert_sample_results() -> Dict[str, int]:
-    conn = get_conn()
-    cur = conn.cursor()
     sample_data = [('12213089', 'ITPC204', 'ML', '4', '56', 'Pass'), ('12213085', 'ITPC604', 'COA', '4', '54', 'Pass'), ('12213003', 'ITPC204', 'ML', '4', '23', 'Fail'), ('12213074', 'ITPC304', 'Java', '4', '36', 'Fail'), ('12213053', 'ITPC604', 'COA', '4', '33', 'Fail'), ('12213050', 'ITPC204', 'ML', '4', '7', 'Fail'), ('12213169', 'ITPC404', 'DSA', '4', '70', 'Pass'), ('12213030', 'ITPC604', 'COA', '4', '3', 'Fail'), ('12213012', 'ITPC604', 'COA', '4', '4', 'Fail'), ('12213169', 'ITPC604', 'COA', '4', '4', 'Fail'), ('12213094', 'ITPC204', 'ML', '4', '65', 'Pass'), ('12213094', 'ITPC304', 'Java', '4', '72', 'Pass'), ('12213095', 'ITPC404', 'DSA', '4', '58', 'Pass'), ('12213095', 'ITPC604', 'COA', '4', '42', 'Fail')]
-    inserted = 0
-    try:
-        for student_username, course_code, course_name, semester, marks, status in sample_data:
-            cleaned_username = str(student_username).replace(',', '').strip()
-            cur.execute('SELECT COUNT(*) FROM results WHERE student_username = ? AND course_code = ?', (cleaned_username, course_code))
-            if cur.fetchone()[0] == 0:
-                cur.execute('INSERT INTO results (student_username, course_code, course_name, semester, marks, status) VALUES (?, ?, ?, ?, ?, ?)', (cleaned_username, course_code, course_name, semester, marks, status))
-                inserted += 1
-        conn.commit()
-        return {'inserted': inserted, 'total': len(sample_data)}
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
+    rows = [(normalize_username(student_username), course_code, course_name, semester, marks, status) for student_username, course_code, course_name, semester, marks, status in sample_data]
+    with transaction() as conn:
+        inserted = conn.executemany("INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_epoch) VALUES (?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER)) ON CONFLICT DO NOTHING", rows).rowcount
+    return {'inserted': inserted, 'total': len(sample_data)}
 
+@_queued_write
 def fix_student_username_commas() -> Dict[str, int]:
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        cur.execute('SELECT result_id, student_username FROM results')
-        rows_to_fix = cur.fetchall()
-        updated_count = 0
-        for row in rows_to_fix:
-            result_id = row['result_id']
-            old_username = row['student_username']
-            new_username = str(old_username).replace(',', '').strip()
-            if new_username != str(old_username):
-                cur.execute('UPDATE results SET student_username = ? WHERE result_id = ?', (new_username, result_id))
-                updated_count += 1
-        conn.commit()
-        return {'updated': updated_count, 'checked': len(rows_to_fix)}
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
\ No newline at end of file
+    with transaction() as conn:
+        cur = conn.cursor()
+        updated_count = _normalize_result_usernames(cur)
+        checked = cur.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+    return {'updated': updated_count, 'checked': checked}
\ No newline at end of file
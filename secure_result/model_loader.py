@@ -1,11 +1,18 @@
 from pathlib import Path
+from datetime import datetime
+import functools
+import importlib.util
 import joblib
 import json
 import re
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional, List
+import vector_index
+from typing import Callable, Dict, Any, Optional, List
 import os
+import pickle
+import threading
+import time
 import warnings
 import sys
 warnings.filterwarnings('ignore')
@@ -43,32 +50,15 @@ try:
     warnings.filterwarnings('ignore', category=InconsistentVersionWarning)
 except ImportError:
     pass
-import io
-from contextlib import redirect_stderr, redirect_stdout
-_stderr_buffer = io.StringIO()
-_stdout_buffer = io.StringIO()
-SENTENCE_TRANSFORMERS_AVAILABLE = False
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
 SentenceTransformer = None
+LIFELINES_AVAILABLE = importlib.util.find_spec('lifelines') is not None
 try:
-    with redirect_stderr(_stderr_buffer), redirect_stdout(_stdout_buffer):
-        import os
-        os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
-        os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '0')
-        from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except (ImportError, OSError, ModuleNotFoundError, AttributeError, ValueError, Exception) as e:
-    try:
-        from sentence_transformers import SentenceTransformer
-        SENTENCE_TRANSFORMERS_AVAILABLE = True
-    except:
-        SENTENCE_TRANSFORMERS_AVAILABLE = False
-        SentenceTransformer = None
-try:
-    from lifelines import CoxPHFitter
-    LIFELINES_AVAILABLE = True
+    import streamlit as st
+    _cache_resource = st.cache_resource(show_spinner=False)
 except ImportError:
-    LIFELINES_AVAILABLE = False
-    CoxPHFitter = None
+    st = None
+    _cache_resource = functools.lru_cache(maxsize=None)
 try:
     import nltk
     from nltk.corpus import stopwords
@@ -101,21 +91,12 @@ RESOLVED_COMPLAINTS_CSV = DATA_DIR / 'resolved_complaints.csv'
 CACHE_EMBEDDINGS_PATH = CACHE_DIR / 'resolved_embeddings.npy'
 CACHE_TEXTS_PATH = CACHE_DIR / 'resolved_texts.npy'
 CACHE_METADATA_PATH = CACHE_DIR / 'cache_metadata.json'
+CACHE_INDEX_PATH = CACHE_DIR / 'resolved_index.npz'
+EMBEDDING_CACHE_DTYPE = 'float32'
+VECTOR_INDEX_KIND = 'auto'
 CATEGORY_MAPPING = {0: 'Marks Mismatch', 1: 'Absentee Error', 2: 'Missing Grade', 3: 'Calculation Discrepancy'}
-_model = None
-_vectorizer = None
-_label_encoder = None
-_sbert_model = None
-_survival_model = None
-_anomaly_model = None
-_le_student_program = None
-_le_faculty_department = None
-_sla_features = None
-_resolved_complaints_df = None
-_complaints_df = None
-_cached_embeddings = None
-_cached_texts = None
-_model_info = {'loaded': False, 'classifier_loaded': False, 'vectorizer_loaded': False, 'label_encoder_loaded': False, 'sbert_loaded': False, 'survival_model_loaded': False, 'anomaly_model_loaded': False, 'encoders_loaded': False, 'datasets_loaded': False, 'embeddings_cached': False}
+WARMUP_ARTIFACTS = ('sbert', 'resolved_complaints', 'embeddings', 'similarity_index')
+WARMUP_RETRY_SECONDS = 60
 
 def clean_text(text: str) -> str:
     if not text or not isinstance(text, str):
@@ -133,158 +114,254 @@ def clean_text(text: str) -> str:
     text = re.sub('\\s+', ' ', text).strip()
     return text
 
+def _estimate_memory(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=True).sum())
+        if isinstance(value, np.ndarray):
+            return vector_index.resident_bytes(value)
+        if hasattr(value, 'nbytes'):
+            return int(value.nbytes)
+        if hasattr(value, 'parameters'):
+            return int(sum((p.numel() * p.element_size() for p in value.parameters())))
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+class LazyArtifact:
+
+    def __init__(self, name: str, loader: Callable[[], Any], depends: tuple=()):
+        self.name = name
+        self.loader = loader
+        self.depends = depends
+        self.lock = threading.Lock()
+        self.value = None
+        self.attempted = False
+        self.error: Optional[str] = None
+        self.loaded_at: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.value is not None
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                value = self.loader()
+        except Exception as e:
+            self.error = str(e)[:200]
+        else:
+            self.value = value
+            self.error = None
+            self.loaded_at = datetime.now().isoformat(sep=' ', timespec='seconds')
+            self.memory_bytes = _estimate_memory(value)
+        self.load_seconds = round(time.perf_counter() - start, 3)
+        self.attempted = True
+
+    def get(self) -> Any:
+        if self.attempted:
+            return self.value
+        with self.lock:
+            if not self.attempted:
+                self._load()
+        return self.value
+
+    def reload(self) -> Any:
+        with self.lock:
+            self._load()
+        return self.value
+
+    def status(self) -> Dict[str, Any]:
+        return {'artifact': self.name, 'loaded': self.loaded, 'attempted': self.attempted, 'loaded_at': self.loaded_at, 'load_seconds': self.load_seconds, 'memory_bytes': self.memory_bytes, 'error': self.error}
+
+def _joblib_loader(path: Path, label: str) -> Callable[[], Any]:
+
+    def load():
+        if not path.exists():
+            raise FileNotFoundError(f'{label} not found at {path}')
+        return joblib.load(path)
+    return load
+
+def _csv_loader(path: Path, label: str) -> Callable[[], Any]:
+
+    def load():
+        if not path.exists():
+            raise FileNotFoundError(f'{label} not found at {path}')
+        return pd.read_csv(path)
+    return load
+
+def _load_sbert():
+    global SENTENCE_TRANSFORMERS_AVAILABLE, SentenceTransformer
+    if not SBERT_MODEL_PATH.exists():
+        raise FileNotFoundError(f'SBERT model not found at {SBERT_MODEL_PATH}')
+    try:
+        from sentence_transformers import SentenceTransformer
+        SENTENCE_TRANSFORMERS_AVAILABLE = True
+        return SentenceTransformer(str(SBERT_MODEL_PATH))
+    except ImportError as e:
+        SENTENCE_TRANSFORMERS_AVAILABLE = False
+        raise ImportError(f'SBERT model found but sentence-transformers import failed: {e}') from e
+
+def _load_survival_model():
+    if not LIFELINES_AVAILABLE:
+        raise ImportError('lifelines not available. Install: pip install lifelines')
+    return _joblib_loader(SURVIVAL_MODEL_PATH, 'Survival model')()
+
+def _load_sla_features():
+    if not SLA_FEATURES_PATH.exists():
+        raise FileNotFoundError(f'SLA features not found at {SLA_FEATURES_PATH}')
+    with open(SLA_FEATURES_PATH, 'r') as f:
+        return json.load(f)
+
 def _load_or_compute_embeddings():
-    global _cached_embeddings, _cached_texts, _resolved_complaints_df, _sbert_model
-    if _sbert_model is None or _resolved_complaints_df is None:
-        return False
-    cache_valid = False
+    resolved_df = get_artifact('resolved_complaints')
+    if resolved_df is None:
+        raise RuntimeError('Resolved complaints dataset not loaded')
     if CACHE_EMBEDDINGS_PATH.exists() and CACHE_TEXTS_PATH.exists() and CACHE_METADATA_PATH.exists():
         try:
             with open(CACHE_METADATA_PATH, 'r') as f:
                 metadata = json.load(f)
-            current_row_count = len(_resolved_complaints_df)
-            if metadata.get('row_count') == current_row_count:
-                _cached_embeddings = np.load(CACHE_EMBEDDINGS_PATH)
-                _cached_texts = np.load(CACHE_TEXTS_PATH, allow_pickle=True)
-                cache_valid = True
-                _model_info['embeddings_cached'] = True
-        except Exception as e:
+            if metadata.get('row_count') == len(resolved_df):
+                if not metadata.get('normalized') or metadata.get('dtype') != EMBEDDING_CACHE_DTYPE:
+                    vector_index.save_embeddings(CACHE_EMBEDDINGS_PATH, np.load(CACHE_EMBEDDINGS_PATH), EMBEDDING_CACHE_DTYPE)
+                    metadata.update(normalized=True, dtype=EMBEDDING_CACHE_DTYPE)
+                    with open(CACHE_METADATA_PATH, 'w') as f:
+                        json.dump(metadata, f)
+                return vector_index.load_embeddings(CACHE_EMBEDDINGS_PATH)
+        except Exception:
             pass
-    if not cache_valid:
-        if 'Complaint Text' not in _resolved_complaints_df.columns:
-            return False
-        complaint_texts = _resolved_complaints_df['Complaint Text'].fillna('').apply(clean_text).tolist()
-        embeddings = _sbert_model.encode(complaint_texts, convert_to_numpy=True, show_progress_bar=False)
-        _cached_embeddings = embeddings
-        _cached_texts = np.array(complaint_texts, dtype=object)
-        np.save(CACHE_EMBEDDINGS_PATH, embeddings)
-        np.save(CACHE_TEXTS_PATH, _cached_texts)
-        metadata = {'row_count': len(_resolved_complaints_df), 'embedding_dim': embeddings.shape[1] if len(embeddings) > 0 else 0}
-        with open(CACHE_METADATA_PATH, 'w') as f:
-            json.dump(metadata, f)
-        _model_info['embeddings_cached'] = True
-    return True
+    sbert_model = get_artifact('sbert')
+    if sbert_model is None:
+        raise RuntimeError('SBERT model not loaded; cannot compute embeddings')
+    if 'Complaint Text' not in resolved_df.columns:
+        raise KeyError('Complaint Text column missing from resolved complaints')
+    complaint_texts = resolved_df['Complaint Text'].fillna('').apply(clean_text).tolist()
+    embeddings = sbert_model.encode(complaint_texts, convert_to_numpy=True, show_progress_bar=False)
+    vector_index.save_embeddings(CACHE_EMBEDDINGS_PATH, embeddings, EMBEDDING_CACHE_DTYPE)
+    np.save(CACHE_TEXTS_PATH, np.array(complaint_texts, dtype=object))
+    metadata = {'row_count': len(resolved_df), 'embedding_dim': embeddings.shape[1] if len(embeddings) > 0 else 0, 'normalized': True, 'dtype': EMBEDDING_CACHE_DTYPE}
+    with open(CACHE_METADATA_PATH, 'w') as f:
+        json.dump(metadata, f)
+    return vector_index.load_embeddings(CACHE_EMBEDDINGS_PATH)
+
+def _load_similarity_index():
+    embeddings = get_artifact('embeddings')
+    if embeddings is None:
+        raise RuntimeError('Embeddings not loaded; cannot build similarity index')
+    return vector_index.load_or_build_index(embeddings, CACHE_INDEX_PATH, VECTOR_INDEX_KIND, normalized=True)
+
+class ModelRegistry:
+
+    def __init__(self):
+        self.artifacts: Dict[str, LazyArtifact] = {artifact.name: artifact for artifact in (LazyArtifact('classifier', _joblib_loader(CLASSIFIER_PATH, 'Classifier')), LazyArtifact('vectorizer', _joblib_loader(VECTORIZER_PATH, 'Vectorizer')), LazyArtifact('label_encoder', _joblib_loader(LABEL_ENCODER_PATH, 'Label encoder')), LazyArtifact('sbert', _load_sbert), LazyArtifact('survival_model', _load_survival_model), LazyArtifact('sla_features', _load_sla_features), LazyArtifact('anomaly_model', _joblib_loader(ANOMALY_MODEL_PATH, 'Anomaly model')), LazyArtifact('le_student_program', _joblib_loader(LE_STUDENT_PROGRAM_PATH, 'Student program encoder')), LazyArtifact('le_faculty_department', _joblib_loader(LE_FACULTY_DEPARTMENT_PATH, 'Faculty department encoder')), LazyArtifact('resolved_complaints', _csv_loader(RESOLVED_COMPLAINTS_CSV, 'Resolved complaints CSV')), LazyArtifact('complaints', _csv_loader(COMPLAINTS_CSV, 'Complaints CSV')), LazyArtifact('embeddings', _load_or_compute_embeddings, depends=('sbert', 'resolved_complaints')), LazyArtifact('similarity_index', _load_similarity_index, depends=('embeddings',)))}
+        self.warmup_lock = threading.Lock()
+        self.warmup_thread: Optional[threading.Thread] = None
+        self.warmup_status: Dict[str, Any] = {'state': 'idle'}
+        self.warmup_failed_at = 0.0
+
+    def get(self, name: str) -> Any:
+        return self.artifacts[name].get()
+
+    def peek(self, name: str) -> Any:
+        return self.artifacts[name].value
+
+    def load_all(self):
+        for artifact in self.artifacts.values():
+            artifact.get()
+
+    def reload(self, names: Optional[List[str]]=None):
+        selected = set(self.artifacts if names is None else names)
+        for artifact in self.artifacts.values():
+            if artifact.name in selected or selected.intersection(artifact.depends):
+                selected.add(artifact.name)
+                artifact.reload()
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [artifact.status() for artifact in self.artifacts.values()]
+
+@_cache_resource
+def get_registry() -> ModelRegistry:
+    return ModelRegistry()
+
+def get_artifact(name: str) -> Any:
+    return get_registry().get(name)
 
 def load_model():
-    global _model, _vectorizer, _label_encoder, _sbert_model
-    global _survival_model, _anomaly_model, _le_student_program, _le_faculty_department
-    global _sla_features, _resolved_complaints_df, _complaints_df, _model_info
-    global SENTENCE_TRANSFORMERS_AVAILABLE, SentenceTransformer
-    errors = []
-    with warnings.catch_warnings():
-        warnings.simplefilter('ignore')
-        try:
-            if CLASSIFIER_PATH.exists():
-                _model = joblib.load(CLASSIFIER_PATH)
-                _model_info['classifier_loaded'] = True
-            else:
-                errors.append(f'Classifier not found at {CLASSIFIER_PATH}')
-            if VECTORIZER_PATH.exists():
-                _vectorizer = joblib.load(VECTORIZER_PATH)
-                _model_info['vectorizer_loaded'] = True
-            else:
-                errors.append(f'Vectorizer not found at {VECTORIZER_PATH}')
-            if LABEL_ENCODER_PATH.exists():
-                _label_encoder = joblib.load(LABEL_ENCODER_PATH)
-                _model_info['label_encoder_loaded'] = True
-            else:
-                errors.append(f'Label encoder not found at {LABEL_ENCODER_PATH}')
-            if SBERT_MODEL_PATH.exists():
-                if SENTENCE_TRANSFORMERS_AVAILABLE:
-                    try:
-                        with warnings.catch_warnings():
-                            warnings.simplefilter('ignore')
-                            with redirect_stderr(_stderr_buffer), redirect_stdout(_stdout_buffer):
-                                _sbert_model = SentenceTransformer(str(SBERT_MODEL_PATH))
-                        _model_info['sbert_loaded'] = True
-                    except Exception as e:
-                        try:
-                            _sbert_model = SentenceTransformer(str(SBERT_MODEL_PATH))
-                            _model_info['sbert_loaded'] = True
-                        except Exception as e2:
-                            errors.append(f'Could not load SBERT model: {str(e2)[:100]}')
-                else:
-                    try:
-                        from sentence_transformers import SentenceTransformer
-                        with warnings.catch_warnings():
-                            warnings.simplefilter('ignore')
-                            with redirect_stderr(_stderr_buffer), redirect_stdout(_stdout_buffer):
-                                _sbert_model = SentenceTransformer(str(SBERT_MODEL_PATH))
-                        _model_info['sbert_loaded'] = True
-                        import sys
-                        sys.modules[__name__].SENTENCE_TRANSFORMERS_AVAILABLE = True
-                        sys.modules[__name__].SentenceTransformer = SentenceTransformer
-                    except Exception as e:
-                        errors.append(f'SBERT model found but sentence-transformers import failed: {str(e)[:100]}')
-            else:
-                errors.append(f'SBERT model not found at {SBERT_MODEL_PATH}')
-            if LIFELINES_AVAILABLE and SURVIVAL_MODEL_PATH.exists():
-                try:
-                    _survival_model = joblib.load(SURVIVAL_MODEL_PATH)
-                    _model_info['survival_loaded'] = True
-                except Exception as e:
-                    errors.append(f'Could not load survival model: {e}')
-            else:
-                if not LIFELINES_AVAILABLE:
-                    errors.append('lifelines not available. Install: pip install lifelines')
-                if not SURVIVAL_MODEL_PATH.exists():
-                    errors.append(f'Survival model not found at {SURVIVAL_MODEL_PATH}')
-            if SLA_FEATURES_PATH.exists():
-                try:
-                    with open(SLA_FEATURES_PATH, 'r') as f:
-                        _sla_features = json.load(f)
-                except Exception as e:
-                    errors.append(f'Could not load SLA features: {e}')
-            else:
-                errors.append(f'SLA features not found at {SLA_FEATURES_PATH}')
-            if ANOMALY_MODEL_PATH.exists():
-                try:
-                    _anomaly_model = joblib.load(ANOMALY_MODEL_PATH)
-                    _model_info['anomaly_loaded'] = True
-                except Exception as e:
-                    errors.append(f'Could not load anomaly model: {e}')
-            else:
-                errors.append(f'Anomaly model not found at {ANOMALY_MODEL_PATH}')
-            if LE_STUDENT_PROGRAM_PATH.exists():
-                try:
-                    _le_student_program = joblib.load(LE_STUDENT_PROGRAM_PATH)
-                except Exception as e:
-                    errors.append(f'Could not load student program encoder: {e}')
-            else:
-                errors.append(f'Student program encoder not found at {LE_STUDENT_PROGRAM_PATH}')
-            if LE_FACULTY_DEPARTMENT_PATH.exists():
-                try:
-                    _le_faculty_department = joblib.load(LE_FACULTY_DEPARTMENT_PATH)
-                except Exception as e:
-                    errors.append(f'Could not load faculty department encoder: {e}')
-            else:
-                errors.append(f'Faculty department encoder not found at {LE_FACULTY_DEPARTMENT_PATH}')
-            if _le_student_program is not None and _le_faculty_department is not None:
-                _model_info['encoders_loaded'] = True
-            if RESOLVED_COMPLAINTS_CSV.exists():
-                try:
-                    _resolved_complaints_df = pd.read_csv(RESOLVED_COMPLAINTS_CSV)
-                    _model_info['datasets_loaded'] = True
-                except Exception as e:
-                    errors.append(f'Could not load resolved_complaints.csv: {e}')
-            else:
-                errors.append(f'Resolved complaints CSV not found at {RESOLVED_COMPLAINTS_CSV}')
-            if COMPLAINTS_CSV.exists():
-                try:
-                    _complaints_df = pd.read_csv(COMPLAINTS_CSV)
-                except Exception as e:
-                    errors.append(f'Could not load complaints.csv: {e}')
+    get_registry().load_all()
+
+def reload_models(names: Optional[List[str]]=None):
+    get_registry().reload(names)
+
+class SimilarResults(list):
+
+    def __init__(self, results=(), status: str='ready'):
+        super().__init__(results)
+        self.status = status
+
+def _run_warmup(registry: ModelRegistry):
+    status = registry.warmup_status
+    start = time.perf_counter()
+    try:
+        for name in WARMUP_ARTIFACTS:
+            status['current'] = name
+            artifact = registry.artifacts[name]
+            if artifact.attempted and (not artifact.loaded):
+                artifact.reload()
             else:
-                errors.append(f'Complaints CSV not found at {COMPLAINTS_CSV}')
-            if _sbert_model is not None and _resolved_complaints_df is not None:
-                _load_or_compute_embeddings()
-            _model_info['loaded'] = True
-            pass
-        except Exception as e:
-            raise
+                artifact.get()
+        errors = {name: registry.artifacts[name].error for name in WARMUP_ARTIFACTS if not registry.artifacts[name].loaded}
+        if errors:
+            status.update(state='failed', errors=errors)
+        else:
+            status.update(state='ready')
+    except Exception as e:
+        status.update(state='failed', errors={'warmup': str(e)[:200]})
+    status.pop('current', None)
+    if status['state'] == 'failed':
+        registry.warmup_failed_at = time.monotonic()
+    status.update(seconds=round(time.perf_counter() - start, 3), finished_at=datetime.now().isoformat(sep=' ', timespec='seconds'))
+
+def start_warmup() -> bool:
+    registry = get_registry()
+    status = registry.warmup_status
+    with registry.warmup_lock:
+        if status['state'] == 'loading' or status['state'] == 'ready':
+            return False
+        if status['state'] == 'failed' and time.monotonic() - registry.warmup_failed_at < WARMUP_RETRY_SECONDS:
+            return False
+        status.pop('errors', None)
+        status.update(state='loading', started_at=datetime.now().isoformat(sep=' ', timespec='seconds'))
+        registry.warmup_thread = threading.Thread(target=_run_warmup, args=(registry,), name='model-warmup', daemon=True)
+        registry.warmup_thread.start()
+    return True
+
+def warmup_status() -> Dict[str, Any]:
+    return dict(get_registry().warmup_status)
+
+def similarity_status() -> str:
+    registry = get_registry()
+    artifacts = [registry.artifacts[name] for name in WARMUP_ARTIFACTS]
+    if all((artifact.loaded for artifact in artifacts)):
+        return 'ready'
+    if registry.warmup_status['state'] == 'loading':
+        return 'loading'
+    if any((artifact.attempted for artifact in artifacts)):
+        return 'failed'
+    return 'idle'
+
+def similarity_ready() -> bool:
+    return similarity_status() == 'ready'
 
 def predict_category(text: str, metadata: Optional[dict]=None) -> Dict[str, Any]:
-    if _model is None or _vectorizer is None or _label_encoder is None:
+    _model = get_artifact('classifier')
+    _vectorizer = get_artifact('vectorizer')
+    if _model is None or _vectorizer is None or get_artifact('label_encoder') is None:
         raise RuntimeError('Models not loaded. Core models (classifier, vectorizer, label_encoder) are required.')
     cleaned_text = clean_text(text)
     X = _vectorizer.transform([cleaned_text])
@@ -322,33 +399,22 @@ def predict_category(text: str, metadata: Optional[dict]=None) -> Dict[str, Any]
         top_keywords = []
     return {'prediction': str(category_name), 'confidence': float(confidence), 'top_keywords': top_keywords}
 
-def find_similar_complaint(text: str, top_k: int=1) -> List[Dict[str, Any]]:
-    if _sbert_model is None:
-        return []
-    if _resolved_complaints_df is None:
-        return []
-    if _cached_embeddings is None:
-        return []
+def find_similar_complaint(text: str, top_k: int=1) -> SimilarResults:
+    if not similarity_ready():
+        start_warmup()
+        return SimilarResults(status=similarity_status())
+    registry = get_registry()
+    _sbert_model = registry.peek('sbert')
+    _resolved_complaints_df = registry.peek('resolved_complaints')
+    _similarity_index = registry.peek('similarity_index')
+    if _sbert_model is None or _resolved_complaints_df is None or _similarity_index is None:
+        return SimilarResults(status='failed')
     cleaned_text = clean_text(text)
     query_embedding = _sbert_model.encode([cleaned_text], convert_to_numpy=True)[0]
-    try:
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarities = cosine_similarity([query_embedding], _cached_embeddings)[0]
-    except ImportError:
-
-        def cosine_sim(a, b):
-            dot_product = np.dot(a, b)
-            norm_a = np.linalg.norm(a)
-            norm_b = np.linalg.norm(b)
-            if norm_a == 0 or norm_b == 0:
-                return 0.0
-            return dot_product / (norm_a * norm_b)
-        similarities = np.array([cosine_sim(query_embedding, emb) for emb in _cached_embeddings])
-    top_indices = np.argsort(similarities)[::-1][:top_k]
-    results = []
-    for idx in top_indices:
+    top_indices, similarities = _similarity_index.search(query_embedding, top_k)
+    results = SimilarResults()
+    for idx, similarity_val in zip(top_indices, similarities):
         row = _resolved_complaints_df.iloc[idx]
-        similarity_val = float(similarities[idx])
         results.append({'index': int(idx), 'score': float(similarity_val), 'complaint_type': str(row.get('Complaint Type', '')), 'complaint_text': str(row.get('Complaint Text', '')), 'resolution_desc': str(row.get('Resolution Description', '')), 'resolution_time': int(row.get('Complaint Resolution Time', 0)) if pd.notna(row.get('Complaint Resolution Time')) else None})
     return results
 
@@ -356,6 +422,8 @@ def calculate_sla_metrics(complaint_row: Dict[str, Any]) -> Dict[str, Any]:
     return predict_sla(complaint_row)
 
 def predict_sla(complaint_dict: Dict[str, Any]) -> Dict[str, Any]:
+    _survival_model = get_artifact('survival_model')
+    _sla_features = get_artifact('sla_features')
     if _survival_model is None or _sla_features is None:
         return {'predicted_median_days': 5, 'breach_prob_at_t': 0.0}
     
@@ -459,8 +527,11 @@ def predict_anomaly(features: Dict[str, Any]) -> Dict[str, Any]:
     return detect_anomaly(features)
 
 def detect_anomaly(result_dict: Dict[str, Any]) -> Dict[str, Any]:
+    _anomaly_model = get_artifact('anomaly_model')
     if _anomaly_model is None:
         return {'is_anomaly': False, 'anomaly_score': 0.0, 'explanation': 'Anomaly detection model not available'}
+    _le_student_program = get_artifact('le_student_program')
+    _le_faculty_department = get_artifact('le_faculty_department')
     complaint_type = result_dict.get('Complaint Type', '')
     student_program = result_dict.get('Student Program', '')
     faculty_department = result_dict.get('Faculty Department', '')
@@ -488,20 +559,21 @@ def detect_anomaly(result_dict: Dict[str, Any]) -> Dict[str, Any]:
     return {'is_anomaly': bool(is_anomaly), 'anomaly_score': float(anomaly_score), 'explanation': explanation}
 
 def model_status() -> Dict[str, Any]:
-    global _model_info, _model, _vectorizer, _sbert_model, _survival_model, _anomaly_model
-    global _resolved_complaints_df, _complaints_df
-    status = _model_info.copy()
+    registry = get_registry()
+    loaded = {name: artifact.loaded for name, artifact in registry.artifacts.items()}
+    status = {'loaded': loaded['classifier'] and loaded['vectorizer'] and loaded['label_encoder'], 'all_attempted': all((artifact.attempted for artifact in registry.artifacts.values())), 'similarity_status': similarity_status(), 'classifier_loaded': loaded['classifier'], 'vectorizer_loaded': loaded['vectorizer'], 'label_encoder_loaded': loaded['label_encoder'], 'sbert_loaded': loaded['sbert'], 'survival_model_loaded': loaded['survival_model'], 'anomaly_model_loaded': loaded['anomaly_model'], 'encoders_loaded': loaded['le_student_program'] and loaded['le_faculty_department'], 'datasets_loaded': loaded['resolved_complaints'], 'embeddings_cached': loaded['embeddings']}
+    status['artifacts'] = registry.status()
+    status['warmup'] = warmup_status()
+    if registry.peek('similarity_index') is not None:
+        status['similarity_index'] = dict(registry.peek('similarity_index').info)
+    _model = registry.peek('classifier')
     if _model is not None:
         if hasattr(_model, 'classes_'):
             status['classes'] = _model.classes_.tolist()
         if hasattr(_model, '__class__'):
             status['classifier_type'] = _model.__class__.__name__
-    if _resolved_complaints_df is not None:
-        status['resolved_complaints_count'] = len(_resolved_complaints_df)
-    if _complaints_df is not None:
-        status['complaints_count'] = len(_complaints_df)
+    if registry.peek('resolved_complaints') is not None:
+        status['resolved_complaints_count'] = len(registry.peek('resolved_complaints'))
+    if registry.peek('complaints') is not None:
+        status['complaints_count'] = len(registry.peek('complaints'))
     return status
-try:
-    load_model()
-except Exception as e:
-    pass
\ No newline at end of file
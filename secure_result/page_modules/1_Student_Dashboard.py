@@ -60,6 +60,7 @@ def run():
     st.divider()
     st.subheader('📋 Recent Complaints')
     if complaints:
+        threads = db.get_threads([c.get('complaint_id') for c in complaints[:5]])
         for complaint in complaints[:5]:
             status = complaint.get('status', 'Pending')
             emoji = {'Pending': '🟡', 'Resolved': '🟢', 'In Progress': '🔵', 'Rejected': '🔴'}.get(status, '⚪')
@@ -75,7 +76,7 @@ def run():
                     similar_complaints = find_similar_complaint(complaint.get('text', ''), top_k=1)
                 except Exception:
                     similar_complaints = []
-                messages = db.get_complaint_messages(complaint.get('complaint_id'))
+                messages = threads[complaint.get('complaint_id')]['messages']
                 system_messages = []
                 if similar_complaints and len(similar_complaints) > 0:
                     similar = similar_complaints[0]
@@ -169,7 +170,7 @@ def run():
                 if status == 'Resolved':
                     st.divider()
                     st.subheader('✅ Resolution Details')
-                    resolution_updates = db.get_resolution_updates(complaint.get('complaint_id'))
+                    resolution_updates = threads[complaint.get('complaint_id')]['updates']
                     if resolution_updates:
                         for update in resolution_updates:
                             st.write(f'**Resolved by:** {update.get('admin_username', 'Admin')}')
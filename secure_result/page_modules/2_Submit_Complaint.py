@@ -6,7 +6,7 @@ from pathlib import Path
 from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import db
-from model_loader import predict_category, find_similar_complaint, predict_sla
+from model_loader import predict_category, find_similar_complaint, predict_sla, SimilarResults
 
 def get_category_name(category_value):
     category_mapping = {'0': 'Marks Mismatch', '1': 'Absentee Error', '2': 'Missing Grade', '3': 'Calculation Discrepancy', 'Marks Mismatch': 'Marks Mismatch', 'Absentee Error': 'Absentee Error', 'Missing Grade': 'Missing Grade', 'Calculation Discrepancy': 'Calculation Discrepancy'}
@@ -78,9 +78,13 @@ def run():
                     top_keywords = cat_result.get('top_keywords', [])
                     if top_keywords:
                         st.caption(f'**Keywords:** {', '.join(top_keywords[:5])}')
+                    if similar_complaints.status == 'loading':
+                        st.caption('🔄 Similar-complaint search is still warming up; duplicate check will be available shortly.')
+                    elif similar_complaints.status != 'ready':
+                        st.caption('⚠️ Similar-complaint search is unavailable right now; duplicate check was skipped.')
                 except Exception as e:
                     st.error(f'❌ Error in prediction: {str(e)}')
-                    similar_complaints = []
+                    similar_complaints = SimilarResults(status='failed')
                 if similar_complaints and len(similar_complaints) > 0:
                     similar = similar_complaints[0]
                     similarity_score = similar.get('score', 0.0)
@@ -155,7 +159,7 @@ def run():
                     predicted_category_name = 'Calculation Discrepancy'
                     confidence = 0.0
                     duplicate_reference = None
-                    similar_complaints = []
+                    similar_complaints = SimilarResults(status='failed')
                     median_resolution_time = 5
                     breach_probability = 0.0
                     risk_level = 'Low'
@@ -182,15 +186,18 @@ def run():
                             st.write(f'**Text:** {similar.get('complaint_text', 'N/A')}')
                             if similar.get('resolution_desc'):
                                 st.write(f'**Resolution:** {similar.get('resolution_desc', 'N/A')}')
-                    else:
+                    elif similar_complaints.status == 'ready':
                         st.success('✅ No similar complaints found. This appears to be a new issue.')
+                    else:
+                        st.info('ℹ️ Duplicate check was skipped because similar-complaint search is not available yet.')
                     st.balloons()
                 else:
                     st.error('Failed to submit complaint. Please try again.')
     st.divider()
     st.subheader('📋 Your Previous Complaints')
-    complaints = db.get_complaints_by_student(username)
+    complaints = db.get_complaints_by_student(username, include_archived=True)
     if complaints:
+        threads = db.get_threads([c.get('complaint_id') for c in complaints], include_archived=True)
         for complaint in complaints:
             status = complaint.get('status', 'Pending')
             emoji = {'Pending': '🟡', 'Resolved': '🟢', 'In Progress': '🔵', 'Rejected': '🔴'}.get(status, '⚪')
@@ -203,7 +210,9 @@ def run():
                 c2.write(f'**Category:** {category_display}')
                 c3.write(f'**Status:** {status}')
                 st.divider()
-                if st.button('🗑️ Delete', key=f'delete_complaint_{complaint_id}', type='secondary', use_container_width=True):
+                if complaint.get('archived'):
+                    st.caption('🗄️ This complaint has been archived and can no longer be deleted.')
+                elif st.button('🗑️ Delete', key=f'delete_complaint_{complaint_id}', type='secondary', use_container_width=True):
                     if db.delete_complaint(complaint_id):
                         st.success(f'✅ Complaint #{complaint_id} deleted successfully!')
                         st.rerun()
@@ -212,7 +221,7 @@ def run():
                 st.divider()
                 st.subheader('💬 Communication Thread')
                 similar_complaints = find_similar_complaint(complaint.get('text', ''), top_k=1)
-                messages = db.get_complaint_messages(complaint.get('complaint_id'))
+                messages = threads[complaint_id]['messages']
                 system_messages = []
                 if similar_complaints and len(similar_complaints) > 0:
                     similar = similar_complaints[0]
@@ -272,7 +281,9 @@ def run():
                         message_files = st.file_uploader('Attach Files (Optional)', type=['pdf', 'doc', 'docx', 'txt'], accept_multiple_files=True, key=f'message_files_{complaint.get('complaint_id')}')
                     submit_message = st.form_submit_button('📤 Send Message', use_container_width=True, type='primary')
                     if submit_message:
-                        if not message_text and (not message_images) and (not message_files):
+                        if complaint.get('archived'):
+                            st.error('⚠️ This complaint has been archived and no longer accepts messages.')
+                        elif not message_text and (not message_images) and (not message_files):
                             st.error('⚠️ Please provide a message, image, or file.')
                         else:
                             try:
@@ -316,7 +327,7 @@ def run():
                 if status == 'Resolved':
                     st.divider()
                     st.subheader('✅ Resolution Details')
-                    resolution_updates = db.get_resolution_updates(complaint.get('complaint_id'))
+                    resolution_updates = threads[complaint_id]['updates']
                     if resolution_updates:
                         for update in resolution_updates:
                             st.write(f'**Resolved by:** {update.get('admin_username', 'Admin')}')
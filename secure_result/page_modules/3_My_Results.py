@@ -18,17 +18,13 @@ def run():
         return
     results = db.get_results_by_student(username)
     if not results:
-        import sqlite3
-        from pathlib import Path
-        DB_PATH = Path(__file__).parent.parent.parent / 'data' / 'db.sqlite3'
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute('SELECT COUNT(*) as total FROM results')
-            total_results = cur.fetchone()['total']
-            cur.execute('SELECT DISTINCT student_username FROM results LIMIT 20')
-            all_usernames = [dict(r)['student_username'] for r in cur.fetchall()]
+            with db.connection() as conn:
+                cur = conn.cursor()
+                cur.execute('SELECT COUNT(*) as total FROM results')
+                total_results = cur.fetchone()['total']
+                cur.execute('SELECT DISTINCT student_username FROM results LIMIT 20')
+                all_usernames = [dict(r)['student_username'] for r in cur.fetchall()]
             cleaned_login = str(username).replace(',', '').strip()
             if total_results == 0:
                 st.warning('⚠️ **No results found in database.**')
@@ -46,7 +42,6 @@ def run():
                     st.caption(f'**Available usernames in database:** {', '.join([str(u) for u in all_usernames[:10]])}')
             else:
                 st.info(f"No results found for username '{username}'. Results will appear here once uploaded by an admin.")
-            conn.close()
         except Exception as e:
             st.info(f"No results found for username '{username}'. Results will appear here once uploaded by an admin.")
             st.caption(f'Error checking database: {str(e)}')
@@ -4,6 +4,7 @@ from pathlib import Path
 from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import db
+import backup
 from model_loader import predict_sla, find_similar_complaint
 import pandas as pd
 import plotly.express as px
@@ -21,27 +22,14 @@ def run():
         st.error('Admin access required. Please login as an admin.')
         return
     st.subheader(f'Welcome, {username} — Admin Overview')
-    complaints = db.get_all_complaints(limit=1000)
-    try:
-        import sqlite3
-        from pathlib import Path
-        DB_PATH = Path(__file__).parent.parent.parent / 'data' / 'db.sqlite3'
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute('SELECT status, COUNT(*) as cnt FROM results GROUP BY status')
-        rows = cur.fetchall()
-        results_summary = {r['status']: r['cnt'] for r in rows}
-        cur.execute('SELECT course_code, COUNT(*) as cnt FROM results GROUP BY course_code ORDER BY cnt DESC LIMIT 10')
-        top_courses = [dict(r) for r in cur.fetchall()]
-        conn.close()
-    except Exception:
-        results_summary = {}
-        top_courses = []
-    total_complaints = len(complaints)
-    pending = sum((1 for c in complaints if c.get('status') == 'Pending'))
-    in_progress = sum((1 for c in complaints if c.get('status') == 'In Progress'))
-    resolved = sum((1 for c in complaints if c.get('status') == 'Resolved'))
+    summary = db.get_dashboard_summary()
+    complaints = db.get_complaints_page(page_size=1000, filters={'exclude': {'status': ['Resolved', 'Rejected']}}, row_format='compact')['items']
+    results_summary = summary['results_by_status']
+    top_courses = [{'course_code': course, 'cnt': count} for course, count in sorted(summary['results_by_course'].items(), key=lambda item: item[1], reverse=True)[:10]]
+    total_complaints = summary['complaints_total']
+    pending = summary['complaints_by_status'].get('Pending', 0)
+    in_progress = summary['complaints_by_status'].get('In Progress', 0)
+    resolved = summary['complaints_by_status'].get('Resolved', 0)
     col1, col2, col3, col4 = st.columns(4)
     col1.metric('Total Complaints', total_complaints)
     col2.metric('Pending', pending)
@@ -51,19 +39,20 @@ def run():
     st.subheader('⏱️ SLA Risk Analytics (ML-Powered)')
     sla_data = []
     duplicate_count = 0
+    latest_results = db.get_latest_results_for_students([c.student_username for c in complaints])
     for complaint in complaints:
-        if complaint.get('status') in ['Resolved', 'Rejected']:
+        if complaint.status in ['Resolved', 'Rejected']:
             continue
-        category_display = get_category_name(complaint.get('predicted_category', 'Calculation Discrepancy'))
-        student_username = complaint.get('student_username', '')
-        student_results = db.get_results_by_student(student_username)
+        category_display = get_category_name(complaint.predicted_category)
+        student_username = complaint.student_username
+        student_results = [latest_results[student_username]] if student_username in latest_results else []
         faculty_department = 'Computer Science'
         if student_results:
             latest_result = student_results[0] if student_results else None
             if latest_result:
                 faculty_department = latest_result.get('faculty_department', faculty_department)
-        course_code = complaint.get('course_code', '')
-        semester = complaint.get('semester', '')
+        course_code = complaint.course_code
+        semester = complaint.semester
         student_program = None
         if student_results:
             latest_result = student_results[0] if student_results else None
@@ -84,8 +73,8 @@ def run():
             breach_probability = 0.0
             median_resolution_time = 5
             risk_level = 'Low'
-        sla_data.append({'risk_level': risk_level, 'breach_probability': breach_probability, 'median_resolution_time': median_resolution_time, 'complaint_id': complaint.get('complaint_id'), 'status': complaint.get('status', 'Pending')})
-        if complaint.get('duplicate_reference') is not None:
+        sla_data.append({'risk_level': risk_level, 'breach_probability': breach_probability, 'median_resolution_time': median_resolution_time, 'complaint_id': complaint.complaint_id, 'status': complaint.status})
+        if complaint.duplicate_reference is not None:
             duplicate_count += 1
     if sla_data:
         high_risk_count = sum((1 for r in sla_data if r['risk_level'] == 'High'))
@@ -102,20 +91,18 @@ def run():
         fig_risk.update_layout(showlegend=False)
         st.plotly_chart(fig_risk, use_container_width=True)
         st.write('**Additional Statistics:**')
-        stat_col1, stat_col2, stat_col3 = st.columns(3)
+        stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
         with stat_col1:
             st.metric('Medium Risk', medium_risk_count)
         with stat_col2:
             st.metric('Low Risk', low_risk_count)
         with stat_col3:
             st.metric('Average Breach Probability', f'{mean_breach_prob * 100:.1f}%', help='Average probability of SLA breach (resolution > 7 days)')
+        with stat_col4:
+            st.metric('Open > 7 Days', db.count_open_complaints_older_than(7), help='Open complaints already past the 7-day SLA threshold')
         if duplicate_count > 0:
             st.write('**Duplicate Complaint Statistics:**')
-            duplicate_complaints = [c for c in complaints if c.get('duplicate_reference') is not None]
-            duplicate_by_status = {}
-            for dup in duplicate_complaints:
-                status = dup.get('status', 'Pending')
-                duplicate_by_status[status] = duplicate_by_status.get(status, 0) + 1
+            duplicate_by_status = summary['duplicates_by_status']
             dup_df = pd.DataFrame({'Status': list(duplicate_by_status.keys()), 'Count': list(duplicate_by_status.values())})
             if not dup_df.empty:
                 fig_dup = px.pie(dup_df, names='Status', values='Count', title='Duplicate Complaints by Status')
@@ -124,18 +111,20 @@ def run():
         st.info('No unresolved complaints available for SLA risk analysis.')
     st.divider()
     st.subheader('Complaint Categories')
-    categories = [get_category_name(c.get('predicted_category') or 'Calculation Discrepancy') for c in complaints]
+    categories = {}
+    for category, count in summary['complaints_by_category'].items():
+        category_display = get_category_name(category or 'Calculation Discrepancy')
+        categories[category_display] = categories.get(category_display, 0) + count
     if categories:
-        df_cat = pd.DataFrame({'category': categories})
-        fig_cat = px.pie(df_cat, names='category', title='Predicted Category Distribution')
+        df_cat = pd.DataFrame({'category': list(categories.keys()), 'count': list(categories.values())})
+        fig_cat = px.pie(df_cat, names='category', values='count', title='Predicted Category Distribution')
         st.plotly_chart(fig_cat, use_container_width=True)
     else:
         st.info('No complaints available to build category chart.')
     st.subheader('Complaints Over Time')
-    dates = [c.get('created_at', '')[:10] for c in complaints if c.get('created_at')]
+    dates = {date: count for date, count in summary['complaints_by_date'].items() if date}
     if dates:
-        df_time = pd.DataFrame({'date': dates})
-        df_time = df_time.groupby('date').size().reset_index(name='count')
+        df_time = pd.DataFrame({'date': list(dates.keys()), 'count': list(dates.values())})
         df_time = df_time.sort_values('date')
         fig_time = px.bar(df_time, x='date', y='count', title='Complaints by Date')
         st.plotly_chart(fig_time, use_container_width=True)
@@ -158,7 +147,7 @@ def run():
     qcol1, qcol2 = st.columns([2, 1])
     with qcol1:
         st.markdown('**Recent complaints (latest 10)**')
-        for c in complaints[:10]:
+        for c in db.get_complaints_page(page_size=10)['items']:
             status = c.get('status', 'Pending')
             status_emoji = {'Pending': '🟡', 'Resolved': '🟢', 'In Progress': '🔵', 'Rejected': '🔴'}.get(status, '⚪')
             category_display = get_category_name(c.get('predicted_category', 'Calculation Discrepancy'))
@@ -186,6 +175,40 @@ def run():
             st.info("Use the sidebar navigation to access 'View Complaints' page.")
         if st.button('Upload Results CSV', use_container_width=True, key='admin_dash_upload_results_btn'):
             st.info("Use the sidebar navigation to access 'Upload Results (CSV)' page to upload a CSV file of marks.")
+        archive_days = st.number_input('Archive closed complaints older than (days)', min_value=1, value=db.ARCHIVE_AFTER_DAYS, step=30, key='admin_dash_archive_days')
+        if st.button('Archive Closed Complaints', use_container_width=True, key='admin_dash_archive_btn'):
+            moved = db.archive_closed_complaints(older_than_days=int(archive_days))
+            st.success(f"Archived {moved['complaints']} complaints, {moved['complaint_messages']} messages and {moved['resolution_updates']} resolution updates.")
+        if st.button('Back Up Database', use_container_width=True, key='admin_dash_backup_btn'):
+            if not backup.start_backup():
+                st.info('A backup is already running.')
+        backup_state = backup.backup_status()
+        if backup_state['state'] == 'running':
+            st.progress(backup_state.get('percent', 0.0) / 100.0, text=f"Backing up… {backup_state.get('percent', 0.0):.1f}% ({backup_state.get('mb_per_sec', 0.0):.1f} MB/s)")
+        elif backup_state['state'] == 'done':
+            st.caption(f"Last backup: {backup_state['dest']} ({backup_state['bytes'] / 1000000.0:.1f} MB in {backup_state['seconds']:.1f}s)")
+        elif backup_state['state'] == 'failed':
+            st.error(f"Backup failed: {backup_state.get('error')}")
+    st.divider()
+    with st.expander('🩺 Database Query Stats', expanded=False):
+        query_stats = db.get_query_stats()
+        if query_stats['statements']:
+            stats_df = pd.DataFrame(query_stats['statements'])
+            st.dataframe(stats_df[['sql', 'calls', 'total_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'rows', 'full_scan']], use_container_width=True, hide_index=True)
+            full_scans = stats_df[stats_df['full_scan']]
+            for _, row in full_scans.iterrows():
+                st.warning(f"Full scan: `{row['sql']}`")
+                st.code('\n'.join(row['plan']))
+        else:
+            st.info('No queries recorded yet.')
+        st.write(f"**Slow queries (≥ {query_stats['slow_query_ms']:.0f} ms):**")
+        if query_stats['slow_queries']:
+            st.dataframe(pd.DataFrame(query_stats['slow_queries']), use_container_width=True, hide_index=True)
+        else:
+            st.caption('None recorded.')
+        if st.button('Reset Query Stats', key='admin_dash_reset_query_stats'):
+            db.reset_query_stats()
+            st.rerun()
     st.divider()
     st.caption("Tip: Use 'Upload Results (CSV)' to bulk-upload student marks. Use 'View Complaints' to manage and reclassify items.")
 run()
\ No newline at end of file
@@ -6,8 +6,7 @@ import uuid
 import json
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import db
-from model_loader import predict_category, find_similar_complaint, predict_sla
-import pandas as pd
+from model_loader import predict_category, find_similar_complaint, predict_sla, SimilarResults
 
 def get_category_name(category_value):
     category_mapping = {'0': 'Marks Mismatch', '1': 'Absentee Error', '2': 'Missing Grade', '3': 'Calculation Discrepancy', 'Marks Mismatch': 'Marks Mismatch', 'Absentee Error': 'Absentee Error', 'Missing Grade': 'Missing Grade', 'Calculation Discrepancy': 'Calculation Discrepancy'}
@@ -24,7 +23,13 @@ def render_duplicate_insights(complaint_text: str, complaint_id: int):
         similar_complaints = find_similar_complaint(complaint_text, top_k=3)
     except Exception as e:
         st.error(f'Error finding similar complaints: {str(e)}')
-        similar_complaints = []
+        similar_complaints = SimilarResults(status='failed')
+    if similar_complaints.status == 'loading':
+        st.info('🔄 Similar-complaint search is still warming up; check back shortly.')
+        return
+    if similar_complaints.status != 'ready':
+        st.warning('⚠️ Similar-complaint search is unavailable right now.')
+        return
     if not similar_complaints:
         st.info('ℹ️ No similar complaints found in historical data.')
         return
@@ -55,11 +60,11 @@ def render_duplicate_insights(complaint_text: str, complaint_id: int):
             st.text_area('Similar Complaint', value=similar.get('complaint_text', 'N/A'), height=100, key=f'similar_text_{complaint_id}_{idx}', disabled=True)
         st.divider()
 
-def render_sla_prediction_panel(complaint: dict):
+def render_sla_prediction_panel(complaint: dict, latest_results: dict):
     st.subheader('⏱️ SLA Breach Prediction')
     complaint_text = complaint.get('text', '')
     student_username = complaint.get('student_username', '')
-    student_results = db.get_results_by_student(student_username)
+    student_results = [latest_results[student_username]] if student_username in latest_results else []
     faculty_department = 'Computer Science'
     student_program = None
     if student_results:
@@ -155,10 +160,6 @@ def run():
     if not username or role != 'admin':
         st.error('Admin access required. Please login as an admin.')
         return
-    complaints = db.get_all_complaints(limit=1000)
-    if not complaints:
-        st.info('No complaints in the system yet.')
-        return
 
     def get_category_id(category_name):
         reverse_mapping = {'Marks Mismatch': ['0', 'Marks Mismatch'], 'Absentee Error': ['1', 'Absentee Error'], 'Missing Grade': ['2', 'Missing Grade'], 'Calculation Discrepancy': ['3', 'Calculation Discrepancy']}
@@ -172,31 +173,39 @@ def run():
         category_filter = st.selectbox('Filter by Category', category_options, index=0)
     with col3:
         search_term = st.text_input('Search (Student/Text)', placeholder='Search by student or complaint text...')
+    facets = db.get_complaint_facets(('course_code', 'semester'))
     col4, col5, col6, col7 = st.columns(4)
     with col4:
         sla_risk_filter = st.selectbox('Filter by SLA Risk', ['All', 'High', 'Medium', 'Low'], index=0)
     with col5:
-        unique_course_codes = sorted(set([c.get('course_code') for c in complaints if c.get('course_code')]))
-        course_code_filter = st.selectbox('Filter by Course Code', ['All'] + unique_course_codes, index=0)
+        course_code_filter = st.selectbox('Filter by Course Code', ['All'] + facets['course_code'], index=0)
     with col6:
-        unique_semesters = sorted(set([c.get('semester') for c in complaints if c.get('semester')]))
-        semester_filter = st.selectbox('Filter by Semester', ['All'] + unique_semesters, index=0)
+        semester_filter = st.selectbox('Filter by Semester', ['All'] + facets['semester'], index=0)
     with col7:
         sort_by = st.selectbox('Sort by', ['Newest First', 'Oldest First', 'High Risk First', 'Low Risk First'], index=0)
+    page_filters = {'status': status_filter if status_filter != 'All' else None, 'course_code': course_code_filter if course_code_filter != 'All' else None, 'semester': semester_filter if semester_filter != 'All' else None, 'search': search_term.strip() or None}
+    if category_filter == 'Calculation Discrepancy':
+        page_filters['exclude'] = {'predicted_category': [v for name in category_options[1:] if name != category_filter for v in get_category_id(name)]}
+    elif category_filter != 'All':
+        page_filters['predicted_category'] = get_category_id(category_filter)
+    page_sort = 'oldest' if sort_by == 'Oldest First' else 'newest'
+    page_filter_key = json.dumps([page_filters, page_sort], sort_keys=True)
+    if st.session_state.get('complaints_page_filter') != page_filter_key:
+        st.session_state['complaints_page_filter'] = page_filter_key
+        st.session_state['complaints_page_cursors'] = [None]
+    page_cursors = st.session_state['complaints_page_cursors']
+    page = db.get_complaints_page(cursor=page_cursors[-1], filters=page_filters, sort=page_sort)
+    complaints = page['items']
+    if not complaints and page_cursors == [None] and (not any(page_filters.values())):
+        st.info('No complaints in the system yet.')
+        return
     filtered_complaints = complaints
-    if status_filter != 'All':
-        filtered_complaints = [c for c in filtered_complaints if c.get('status') == status_filter]
-    if category_filter != 'All':
-        category_ids = get_category_id(category_filter)
-        filtered_complaints = [c for c in filtered_complaints if str(c.get('predicted_category') or 'Calculation Discrepancy') in category_ids or get_category_name(c.get('predicted_category') or 'Calculation Discrepancy') == category_filter]
-    if search_term:
-        search_lower = search_term.lower()
-        filtered_complaints = [c for c in filtered_complaints if search_lower in str(c.get('student_username', '')).lower() or search_lower in str(c.get('text', '')).lower()]
+    latest_results = db.get_latest_results_for_students([c.get('student_username', '') for c in complaints])
     for complaint in filtered_complaints:
         if complaint.get('status') not in ['Resolved', 'Rejected']:
             complaint_text = complaint.get('text', '')
             student_username = complaint.get('student_username', '')
-            student_results = db.get_results_by_student(student_username)
+            student_results = [latest_results[student_username]] if student_username in latest_results else []
             faculty_department = 'Computer Science'
             student_program = None
             if student_results:
@@ -230,47 +239,29 @@ def run():
             complaint['sla_median_resolution_time'] = 0.0
     if sla_risk_filter != 'All':
         filtered_complaints = [c for c in filtered_complaints if c.get('sla_risk_level') == sla_risk_filter]
-    if course_code_filter != 'All':
-        filtered_complaints = [c for c in filtered_complaints if c.get('course_code') == course_code_filter]
-    if semester_filter != 'All':
-        filtered_complaints = [c for c in filtered_complaints if c.get('semester') == semester_filter]
     if sort_by == 'High Risk First':
         filtered_complaints.sort(key=lambda x: x.get('sla_breach_probability', 0), reverse=True)
     elif sort_by == 'Low Risk First':
         filtered_complaints.sort(key=lambda x: x.get('sla_breach_probability', 0))
-    elif sort_by == 'Oldest First':
-        for c in filtered_complaints:
-            created_at_str = c.get('created_at', '')
-            try:
-                if isinstance(created_at_str, str):
-                    if 'T' in created_at_str:
-                        created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                    else:
-                        created_at = datetime.strptime(created_at_str, '%Y-%m-%d %H:%M:%S')
-                    c['_sort_date'] = created_at.replace(tzinfo=None) if hasattr(created_at, 'replace') else created_at
-                else:
-                    c['_sort_date'] = datetime.now()
-            except:
-                c['_sort_date'] = datetime.now()
-        filtered_complaints.sort(key=lambda x: x.get('_sort_date', datetime.now()), reverse=True)
-    else:
-        for c in filtered_complaints:
-            created_at_str = c.get('created_at', '')
-            try:
-                if isinstance(created_at_str, str):
-                    if 'T' in created_at_str:
-                        created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                    else:
-                        created_at = datetime.strptime(created_at_str, '%Y-%m-%d %H:%M:%S')
-                    c['_sort_date'] = created_at.replace(tzinfo=None) if hasattr(created_at, 'replace') else created_at
-                else:
-                    c['_sort_date'] = datetime.now()
-            except:
-                c['_sort_date'] = datetime.now()
-        filtered_complaints.sort(key=lambda x: x.get('_sort_date', datetime.now()))
-    st.write(f'Showing {len(filtered_complaints)} of {len(complaints)} complaints')
+    st.write(f'Showing {len(filtered_complaints)} of {db.count_complaints(page_filters)} matching complaints (page {len(page_cursors)})')
+    if page_filters['search']:
+        include_archived = st.checkbox('Include archived complaints in matches', value=False, key='search_include_archived')
+        search_hits = db.search_complaints(page_filters['search'], include_archived=include_archived)
+        if search_hits:
+            with st.expander(f'🔎 Top {len(search_hits)} full-text matches (complaints & messages)', expanded=False):
+                for hit in search_hits:
+                    archived_label = ' | 🗄️ Archived' if hit['archived'] else ''
+                    st.markdown(f"**#{hit['complaint_id']}** | {hit['source'].title()}{archived_label} | {hit['student_username']} | {hit['status']} — {hit['snippet']}")
+    nav_prev, nav_next = st.columns(2)
+    if nav_prev.button('⬅️ Previous Page', disabled=len(page_cursors) == 1, use_container_width=True, key='complaints_prev_page'):
+        page_cursors.pop()
+        st.rerun()
+    if nav_next.button('Next Page ➡️', disabled=page['next_cursor'] is None, use_container_width=True, key='complaints_next_page'):
+        page_cursors.append(page['next_cursor'])
+        st.rerun()
     st.divider()
     view_mode = st.radio('View Mode', ['Cards', 'Table'], horizontal=True)
+    threads = db.get_threads([c.get('complaint_id') for c in filtered_complaints])
     st.divider()
     if view_mode == 'Table':
         for complaint in filtered_complaints:
@@ -307,14 +298,14 @@ def run():
                 st.divider()
                 render_duplicate_insights(complaint.get('text', ''), complaint_id)
                 st.divider()
-                render_sla_prediction_panel(complaint)
+                render_sla_prediction_panel(complaint, latest_results)
                 st.divider()
                 st.subheader('💬 Communication Thread')
                 try:
                     similar_complaints = find_similar_complaint(complaint.get('text', ''), top_k=1)
                 except Exception:
                     similar_complaints = []
-                messages = db.get_complaint_messages(complaint_id)
+                messages = threads[complaint_id]['messages']
                 system_messages = []
                 if similar_complaints and len(similar_complaints) > 0:
                     similar = similar_complaints[0]
@@ -491,14 +482,14 @@ def run():
                 st.divider()
                 render_duplicate_insights(complaint.get('text', ''), complaint_id)
                 st.divider()
-                render_sla_prediction_panel(complaint)
+                render_sla_prediction_panel(complaint, latest_results)
                 st.divider()
                 st.subheader('💬 Communication Thread')
                 try:
                     similar_complaints = find_similar_complaint(complaint.get('text', ''), top_k=1)
                 except Exception:
                     similar_complaints = []
-                messages = db.get_complaint_messages(complaint_id)
+                messages = threads[complaint_id]['messages']
                 system_messages = []
                 if similar_complaints and len(similar_complaints) > 0:
                     similar = similar_complaints[0]
@@ -639,12 +630,8 @@ def run():
                             st.error(f'❌ Error updating category: {str(e)}')
     st.divider()
     st.subheader('📥 Export Complaints')
-    all_complaints = db.get_all_complaints(limit=10000)
-    if all_complaints:
-        export_all_data = []
-        for c in all_complaints:
-            export_all_data.append({'Complaint ID': c.get('complaint_id'), 'Student': c.get('student_username', ''), 'Course Code': c.get('course_code', ''), 'Semester': c.get('semester', ''), 'Text': c.get('text', ''), 'Category': get_category_name(c.get('predicted_category', 'Calculation Discrepancy')), 'Confidence': c.get('confidence', 0) if c.get('confidence') is not None else '', 'Status': c.get('status', 'Pending'), 'File Path': c.get('file_path', ''), 'Created At': c.get('created_at', '')})
-        df_all = pd.DataFrame(export_all_data)
-        csv_all = df_all.to_csv(index=False)
-        st.download_button(label='📥 Export All Complaints as CSV', data=csv_all, file_name=f'all_complaints_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv', mime='text/csv', use_container_width=True, key='export_all_complaints')
+    export_range = st.date_input('Created Between (optional)', value=(), key='export_date_range')
+    export_since = export_range[0] if len(export_range) > 0 else None
+    export_until = export_range[1] + timedelta(days=1) if len(export_range) > 1 else None
+    st.download_button(label='📥 Export All Complaints as CSV', data=lambda: b''.join(db.iter_complaints_csv(since=export_since, until=export_until, formatters={'predicted_category': get_category_name})), file_name=f'all_complaints_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv', mime='text/csv', use_container_width=True, key='export_all_complaints')
 run()
\ No newline at end of file
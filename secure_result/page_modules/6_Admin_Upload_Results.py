@@ -75,9 +75,11 @@ def run():
                     with st.spinner('Importing results...'):
                         result = db.import_results_from_dataframe(df)
                         inserted = result.get('inserted', 0)
+                        updated = result.get('updated', 0)
+                        unchanged = result.get('unchanged', 0)
                         errors = result.get('errors', 0)
-                        if inserted > 0:
-                            st.success(f'✅ Successfully imported {inserted} results!')
+                        if inserted + updated + unchanged > 0:
+                            st.success(f'✅ Successfully imported results! ({inserted} new, {updated} updated, {unchanged} unchanged)')
                             if errors > 0:
                                 st.warning(f'⚠️ {errors} row(s) had errors and were skipped.')
                             st.balloons()
@@ -85,23 +87,22 @@ def run():
                             st.error(f'❌ No results were imported! Check the CSV format and try again.')
                             if errors > 0:
                                 st.error(f'Found {errors} error(s) during import. Please check your CSV data.')
-                        import sqlite3
-                        from pathlib import Path
-                        DB_PATH = Path(__file__).parent.parent.parent / 'data' / 'db.sqlite3'
-                        conn = sqlite3.connect(str(DB_PATH))
-                        conn.row_factory = sqlite3.Row
-                        cur = conn.cursor()
-                        unique_usernames = df['student_username'].unique().tolist()
-                        existing_users = []
-                        missing_users = []
-                        for username in unique_usernames:
-                            cur.execute('SELECT username FROM users WHERE username = ?', (username,))
-                            if cur.fetchone():
-                                existing_users.append(username)
-                            else:
-                                missing_users.append(username)
-                        conn.close()
-                        st.info(f'\n\n                        **Import Summary:**\n\n                        - Records imported: {inserted}\n\n                        - Students affected: {unique_students}\n\n                        - Courses added: {unique_courses}\n\n                        ')
+                        error_rows = result.get('error_rows')
+                        if error_rows is not None and (not error_rows.empty):
+                            with st.expander(f'View {errors} row error(s)', expanded=inserted + updated + unchanged == 0):
+                                st.dataframe(error_rows, use_container_width=True, hide_index=True)
+                        with db.connection() as conn:
+                            cur = conn.cursor()
+                            unique_usernames = df['student_username'].unique().tolist()
+                            existing_users = []
+                            missing_users = []
+                            for username in unique_usernames:
+                                cur.execute('SELECT username FROM users WHERE username = ?', (username,))
+                                if cur.fetchone():
+                                    existing_users.append(username)
+                                else:
+                                    missing_users.append(username)
+                        st.info(f'\n\n                        **Import Summary:**\n\n                        - Records inserted: {inserted}\n\n                        - Records updated: {updated}\n\n                        - Records unchanged: {unchanged}\n\n                        - Students affected: {unique_students}\n\n                        - Courses added: {unique_courses}\n\n                        ')
                         if missing_users:
                             st.warning(f"\n                            ⚠️ **Warning:** {len(missing_users)} student username(s) in the CSV do not have user accounts:\n                            \n                            These students won't be able to login to view their results. \n                            Make sure students create accounts with usernames matching their roll numbers.\n                            \n                            Missing usernames: {', '.join(missing_users[:10])}{('...' if len(missing_users) > 10 else '')}\n                            ")
                         else:
@@ -142,17 +143,12 @@ def run():
     st.divider()
     st.subheader('📊 Recent Uploads Summary')
     try:
-        import sqlite3
-        from pathlib import Path
-        DB_PATH = Path(__file__).parent.parent.parent / 'data' / 'db.sqlite3'
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute('\n\n            SELECT COUNT(*) as total, \n\n                   COUNT(DISTINCT student_username) as students,\n\n                   COUNT(DISTINCT course_code) as courses\n\n            FROM results\n\n        ')
-        stats = cur.fetchone()
-        cur.execute('\n\n            SELECT course_code, COUNT(*) as count \n\n            FROM results \n\n            GROUP BY course_code \n\n            ORDER BY count DESC \n\n            LIMIT 10\n\n        ')
-        top_courses = [dict(r) for r in cur.fetchall()]
-        conn.close()
+        with db.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('\n\n            SELECT COUNT(*) as total, \n\n                   COUNT(DISTINCT student_username) as students,\n\n                   COUNT(DISTINCT course_code) as courses\n\n            FROM results\n\n        ')
+            stats = cur.fetchone()
+            cur.execute('\n\n            SELECT course_code, COUNT(*) as count \n\n            FROM results \n\n            GROUP BY course_code \n\n            ORDER BY count DESC \n\n            LIMIT 10\n\n        ')
+            top_courses = [dict(r) for r in cur.fetchall()]
         col1, col2, col3 = st.columns(3)
         col1.metric('Total Results', stats['total'])
         col2.metric('Total Students', stats['students'])
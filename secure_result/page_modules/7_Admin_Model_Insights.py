@@ -5,11 +5,9 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import joblib
-import json
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import db
-from model_loader import model_status, load_model
+from model_loader import model_status, get_artifact, get_registry
 
 def get_category_name(category_value):
     category_mapping = {'0': 'Marks Mismatch', '1': 'Absentee Error', '2': 'Missing Grade', '3': 'Calculation Discrepancy', 'Marks Mismatch': 'Marks Mismatch', 'Absentee Error': 'Absentee Error', 'Missing Grade': 'Missing Grade', 'Calculation Discrepancy': 'Calculation Discrepancy'}
@@ -17,32 +15,13 @@ def get_category_name(category_value):
     return category_mapping.get(category_str, 'Calculation Discrepancy')
 
 def load_datasets():
-    MODEL_DIR = Path(__file__).parent.parent / 'models'
-    DATA_DIR = MODEL_DIR / 'data'
-    complaints_df = None
-    resolved_df = None
-    try:
-        complaints_path = DATA_DIR / 'complaints.csv'
-        if complaints_path.exists():
-            complaints_df = pd.read_csv(complaints_path)
-    except Exception as e:
-        st.warning(f'Could not load complaints.csv: {e}')
-    try:
-        resolved_path = DATA_DIR / 'resolved_complaints.csv'
-        if resolved_path.exists():
-            resolved_df = pd.read_csv(resolved_path)
-    except Exception as e:
-        st.warning(f'Could not load resolved_complaints.csv: {e}')
-    return (complaints_df, resolved_df)
+    return (get_artifact('complaints'), get_artifact('resolved_complaints'))
 
 def get_sla_coefficients():
-    MODEL_DIR = Path(__file__).parent.parent / 'models'
-    SURVIVAL_MODEL_PATH = MODEL_DIR / 'sla_survival_model.pkl'
-    SLA_FEATURES_PATH = MODEL_DIR / 'sla_features.json'
     try:
-        if not SURVIVAL_MODEL_PATH.exists():
+        survival_model = get_artifact('survival_model')
+        if survival_model is None:
             return None
-        survival_model = joblib.load(SURVIVAL_MODEL_PATH)
         if hasattr(survival_model, 'hazard_ratios_'):
             coefficients = survival_model.hazard_ratios_
             feature_names = survival_model.summary.index.tolist() if hasattr(survival_model, 'summary') else []
@@ -51,9 +30,8 @@ def get_sla_coefficients():
             feature_names = survival_model.summary.index.tolist() if hasattr(survival_model, 'summary') else []
         else:
             return None
-        if SLA_FEATURES_PATH.exists():
-            with open(SLA_FEATURES_PATH, 'r') as f:
-                sla_features = json.load(f)
+        sla_features = get_artifact('sla_features')
+        if sla_features is not None:
             feature_names = sla_features
         if len(coefficients) == len(feature_names):
             importance_df = pd.DataFrame({'Feature': feature_names, 'Coefficient': coefficients, 'Importance': np.abs(coefficients)}).sort_values('Importance', ascending=False)
@@ -73,9 +51,7 @@ def run():
         st.error('Admin access required. Please login as an admin.')
         return
     complaints_df, resolved_df = load_datasets()
-    load_model()
-    api_status = model_status()
-    complaints = db.get_all_complaints(limit=1000)
+    complaints_total = db.count_complaints()
     st.subheader('⏱️ SLA Model Feature Importance (Cox Coefficients)')
     importance_df = get_sla_coefficients()
     if importance_df is not None:
@@ -88,6 +64,31 @@ def run():
     else:
         st.info('SLA model coefficients not available. Ensure sla_survival_model.pkl and sla_features.json exist.')
     st.divider()
+    st.subheader('🧠 Loaded Models')
+    api_status = model_status()
+    registry_df = pd.DataFrame(api_status['artifacts'])
+    registry_df['memory_mb'] = (registry_df['memory_bytes'].astype(float) / 1000000.0).round(2)
+    st.dataframe(registry_df[['artifact', 'loaded', 'loaded_at', 'load_seconds', 'memory_mb', 'error']], use_container_width=True, hide_index=True)
+    loaded_mb = registry_df.loc[registry_df['loaded'], 'memory_mb'].sum()
+    st.caption(f"{int(registry_df['loaded'].sum())}/{len(registry_df)} artifacts loaded, ~{loaded_mb:.1f} MB")
+    warmup = api_status['warmup']
+    if warmup['state'] == 'loading':
+        st.info(f"Similarity warm-up in progress ({warmup.get('current', 'starting')})…")
+    elif warmup['state'] == 'failed':
+        st.warning(f"Similarity warm-up failed: {warmup.get('errors')}")
+    elif warmup['state'] == 'ready':
+        st.caption(f"Similarity search ready (warm-up took {warmup.get('seconds', 0.0):.1f}s)")
+    if 'similarity_index' in api_status:
+        index_info = api_status['similarity_index']
+        index_caption = f"Similarity index: {index_info['kind']} over {index_info['rows']:,} cases, recall {index_info.get('recall', 1.0):.1%}"
+        if 'search_ms' in index_info:
+            index_caption += f" (k={index_info['recall_k']}, n_probe={index_info['n_probe']}, {index_info['search_ms']:.3f} ms/query vs {index_info['exact_ms']:.3f} ms exact)"
+        st.caption(index_caption)
+    if st.button('Reload Models', key='model_insights_reload_btn'):
+        with st.spinner('Reloading models from disk…'):
+            get_registry().reload()
+        st.rerun()
+    st.divider()
     st.subheader('📁 Dataset Information')
     col1, col2 = st.columns(2)
     with col1:
@@ -109,12 +110,8 @@ def run():
         else:
             st.warning('Not loaded')
     st.divider()
-    if complaints:
+    if complaints_total:
         st.subheader('📥 Export Prediction Data')
-        export_data = []
-        for c in complaints:
-            export_data.append({'Complaint ID': c.get('complaint_id'), 'Student': c.get('student_username', ''), 'Text': c.get('text', ''), 'Predicted Category': get_category_name(c.get('predicted_category', 'Calculation Discrepancy')), 'Confidence': c.get('confidence', 0), 'Status': c.get('status', 'Pending'), 'Created At': c.get('created_at', '')})
-        df_export = pd.DataFrame(export_data)
-        csv = df_export.to_csv(index=False)
-        st.download_button(label='📥 Download All Predictions as CSV', data=csv, file_name='model_predictions_export.csv', mime='text/csv', use_container_width=True)
+        export_columns = (('Complaint ID', 'complaint_id'), ('Student', 'student_username'), ('Text', 'text'), ('Predicted Category', 'predicted_category'), ('Confidence', 'confidence'), ('Status', 'status'), ('Created At', 'created_at'))
+        st.download_button(label='📥 Download All Predictions as CSV', data=lambda: b''.join(db.iter_complaints_csv(columns=export_columns, formatters={'predicted_category': get_category_name})), file_name='model_predictions_export.csv', mime='text/csv', use_container_width=True)
 run()
\ No newline at end of file
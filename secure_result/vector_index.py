@@ -0,0 +1,219 @@
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+EXACT_INDEX_MAX_ROWS = 20000
+IVF_TRAIN_SAMPLES_PER_LIST = 64
+IVF_KMEANS_ITERATIONS = 10
+IVF_TARGET_RECALL = 0.95
+IVF_MIN_PROBE = 4
+ASSIGN_CHUNK_ROWS = 4096
+RECALL_QUERIES = 100
+RECALL_K = 10
+RECALL_QUERY_NOISE = 0.1
+SCORE_CHUNK_ROWS = 16384
+EMBEDDING_DTYPES = ('float32', 'float16')
+
+def normalize_rows(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def save_embeddings(path: Path, embeddings: np.ndarray, dtype: str='float32'):
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f'Unsupported embedding dtype: {dtype}')
+    partial = path.with_name(path.stem + '.part.npy')
+    np.save(partial, np.ascontiguousarray(normalize_rows(embeddings), dtype=dtype))
+    partial.replace(path)
+
+def load_embeddings(path: Path) -> np.ndarray:
+    return np.load(path, mmap_mode='r')
+
+def dot_scores(vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+    if vectors.dtype == np.float32:
+        return vectors @ query
+    scores = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), SCORE_CHUNK_ROWS):
+        scores[start:start + SCORE_CHUNK_ROWS] = vectors[start:start + SCORE_CHUNK_ROWS].astype(np.float32) @ query
+    return scores
+
+def resident_bytes(array: np.ndarray) -> int:
+    return 0 if isinstance(array, np.memmap) or isinstance(array.base, np.memmap) else int(array.nbytes)
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(scores, -k)[-k:] if k < len(scores) else np.arange(len(scores))
+    return top[np.argsort(scores[top])[::-1]]
+
+def _fingerprint(vectors: np.ndarray) -> float:
+    return float(np.asarray(vectors[::max(1, len(vectors) // 64)], dtype=np.float64).sum())
+
+class ExactIndex:
+    kind = 'exact'
+
+    def __init__(self, vectors: np.ndarray, info: Optional[Dict[str, Any]]=None, normalized: bool=False):
+        self.vectors = vectors if normalized else normalize_rows(vectors)
+        self.info = info or {'kind': self.kind, 'rows': len(self.vectors), 'recall': 1.0}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def nbytes(self) -> int:
+        return resident_bytes(self.vectors)
+
+    def search(self, query: np.ndarray, k: int=1) -> Tuple[np.ndarray, np.ndarray]:
+        scores = dot_scores(self.vectors, normalize_rows(query))
+        top = top_k_indices(scores, k)
+        return (top, scores[top])
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, normalized: bool=False) -> 'ExactIndex':
+        return cls(vectors, normalized=normalized)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    @classmethod
+    def from_arrays(cls, vectors: np.ndarray, arrays: Dict[str, np.ndarray], info: Dict[str, Any], normalized: bool=False) -> 'ExactIndex':
+        return cls(vectors, info, normalized)
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        assign[start:start + ASSIGN_CHUNK_ROWS] = np.argmax(vectors[start:start + ASSIGN_CHUNK_ROWS] @ centroids.T, axis=1)
+    return assign
+
+def _train_centroids(vectors: np.ndarray, n_lists: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), min(len(vectors), n_lists * IVF_TRAIN_SAMPLES_PER_LIST), replace=False)]
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(IVF_KMEANS_ITERATIONS):
+        assign = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = np.bincount(assign, minlength=n_lists) == 0
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+class IVFIndex:
+    kind = 'ivf'
+
+    def __init__(self, vectors: np.ndarray, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray, n_probe: int, info: Optional[Dict[str, Any]]=None, normalized: bool=False):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.order = np.asarray(order, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.vectors = vectors if normalized else normalize_rows(vectors).astype(vectors.dtype, copy=False)
+        self.n_probe = int(n_probe)
+        self.info = info or {'kind': self.kind, 'rows': len(self.vectors), 'lists': len(self.centroids)}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def nbytes(self) -> int:
+        return resident_bytes(self.vectors) + self.centroids.nbytes + self.order.nbytes + self.offsets.nbytes
+
+    def search(self, query: np.ndarray, k: int=1) -> Tuple[np.ndarray, np.ndarray]:
+        query = normalize_rows(query)
+        ids = []
+        scores = []
+        for list_id in top_k_indices(self.centroids @ query, self.n_probe):
+            start, end = (self.offsets[list_id], self.offsets[list_id + 1])
+            if start < end:
+                rows = self.order[start:end]
+                ids.append(rows)
+                scores.append(dot_scores(self.vectors[rows], query))
+        if not ids:
+            return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+        top = top_k_indices(scores, k)
+        return (ids[top], scores[top])
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, normalized: bool=False, n_lists: Optional[int]=None, target_recall: float=IVF_TARGET_RECALL, seed: int=0) -> 'IVFIndex':
+        stored = vectors if normalized else normalize_rows(vectors).astype(vectors.dtype, copy=False)
+        vectors = normalize_rows(vectors)
+        n_lists = max(1, min(len(vectors), n_lists or int(np.sqrt(len(vectors)))))
+        start = time.perf_counter()
+        centroids = _train_centroids(vectors, n_lists, seed)
+        assign = _assign(vectors, centroids)
+        order = np.argsort(assign, kind='stable')
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assign, minlength=n_lists))))
+        index = cls(stored, centroids, order, offsets, n_probe=min(n_lists, IVF_MIN_PROBE), normalized=True)
+        while True:
+            report = measure_recall(index, vectors)
+            if report['recall'] >= target_recall or index.n_probe >= n_lists:
+                break
+            index.n_probe = min(n_lists, index.n_probe * 2)
+        index.info.update(report, n_probe=index.n_probe, build_seconds=round(time.perf_counter() - start, 3))
+        return index
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'centroids': self.centroids, 'order': self.order, 'offsets': self.offsets}
+
+    @classmethod
+    def from_arrays(cls, vectors: np.ndarray, arrays: Dict[str, np.ndarray], info: Dict[str, Any], normalized: bool=False) -> 'IVFIndex':
+        return cls(vectors, arrays['centroids'], arrays['order'], arrays['offsets'], info['n_probe'], info, normalized)
+INDEX_TYPES = {ExactIndex.kind: ExactIndex, IVFIndex.kind: IVFIndex}
+
+def measure_recall(index: Any, vectors: np.ndarray, n_queries: int=RECALL_QUERIES, k: int=RECALL_K, seed: int=0) -> Dict[str, Any]:
+    vectors = normalize_rows(vectors)
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.choice(len(vectors), min(n_queries, len(vectors)), replace=False)]
+    queries = normalize_rows(queries + rng.normal(0.0, RECALL_QUERY_NOISE / np.sqrt(vectors.shape[1]), queries.shape).astype(np.float32))
+    k = min(k, len(vectors))
+    hits = 0
+    exact_seconds = 0.0
+    index_seconds = 0.0
+    for query in queries:
+        start = time.perf_counter()
+        expected = top_k_indices(vectors @ query, k)
+        exact_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        found, _ = index.search(query, k)
+        index_seconds += time.perf_counter() - start
+        hits += len(np.intersect1d(expected, found))
+    n = max(1, len(queries))
+    return {'recall': round(hits / (n * k), 4) if k else 1.0, 'recall_k': k, 'recall_queries': len(queries), 'exact_ms': round(exact_seconds / n * 1000.0, 4), 'search_ms': round(index_seconds / n * 1000.0, 4)}
+
+def build_index(vectors: np.ndarray, kind: str='auto', normalized: bool=False) -> Any:
+    if kind == 'auto':
+        kind = ExactIndex.kind if len(vectors) <= EXACT_INDEX_MAX_ROWS else IVFIndex.kind
+    if kind not in INDEX_TYPES:
+        raise ValueError(f'Unknown vector index kind: {kind}')
+    return INDEX_TYPES[kind].build(vectors, normalized=normalized)
+
+def save_index(index: Any, path: Path, vectors: np.ndarray):
+    info = dict(index.info, kind=index.kind, rows=len(vectors), dim=int(vectors.shape[1]), fingerprint=_fingerprint(vectors))
+    partial = path.with_name(path.name + '.part.npz')
+    np.savez(partial, info=np.array(json.dumps(info)), **index.arrays())
+    partial.replace(path)
+
+def load_index(path: Path, vectors: np.ndarray, kind: str='auto', normalized: bool=False) -> Optional[Any]:
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        info = json.loads(str(data['info']))
+        if info.get('rows') != len(vectors) or info.get('dim') != vectors.shape[1] or (not np.isclose(info.get('fingerprint', np.nan), _fingerprint(vectors))):
+            return None
+        if kind != 'auto' and info.get('kind') != kind:
+            return None
+        arrays = {name: data[name] for name in data.files if name != 'info'}
+    return INDEX_TYPES[info['kind']].from_arrays(vectors, arrays, info, normalized)
+
+def load_or_build_index(vectors: np.ndarray, path: Path, kind: str='auto', normalized: bool=False) -> Any:
+    try:
+        index = load_index(path, vectors, kind, normalized)
+    except Exception:
+        index = None
+    if index is None:
+        index = build_index(vectors, kind, normalized)
+        save_index(index, path, vectors)
+    return index
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+import pytest
+sys.path.insert(0, str(Path(__file__).parent.parent / 'secure_result'))
+import db
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    db.close_pool()
+    monkeypatch.setattr(db, 'DB_PATH', tmp_path / 'test.sqlite3')
+    db.init_db()
+    yield db
+    db.stop_writer()
+    db.close_pool()
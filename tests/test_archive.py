@@ -0,0 +1,63 @@
+import pytest
+import db
+
+@pytest.fixture
+def aged(fresh_db):
+    ids = {}
+    for name, status, text in (('old_resolved', 'Resolved', 'ML marks were missing from the portal'), ('old_rejected', 'Rejected', 'Java attendance marked absent'), ('old_open', 'Pending', 'ML total looks wrong'), ('new_resolved', 'Resolved', 'DSA marks missing again')):
+        complaint_id = db.add_complaint('1001', text, predicted_category='Missing Grade', course_code='ITPC204')
+        db.update_complaint_status(complaint_id, status)
+        db.add_complaint_message(complaint_id, '1001', 'student', f'follow-up on {name}')
+        db.add_resolution_update(complaint_id, 'admin', f'note for {name}')
+        ids[name] = complaint_id
+    with db.transaction() as conn:
+        conn.execute("UPDATE complaints SET created_at = datetime('now', '-400 days') WHERE complaint_id IN (?, ?, ?)", (ids['old_resolved'], ids['old_rejected'], ids['old_open']))
+    return ids
+
+def test_archive_moves_only_old_closed_complaints(aged):
+    moved = db.archive_closed_complaints(older_than_days=180)
+    assert moved == {'complaints': 2, 'complaint_messages': 2, 'resolution_updates': 2}
+    live = {c['complaint_id'] for c in db.get_all_complaints()}
+    assert live == {aged['old_open'], aged['new_resolved']}
+    with db.connection() as conn:
+        archived = {r[0] for r in conn.execute('SELECT complaint_id FROM complaints_archive')}
+        orphans = conn.execute('SELECT COUNT(*) FROM complaint_messages WHERE complaint_id NOT IN (SELECT complaint_id FROM complaints)').fetchone()[0]
+    assert archived == {aged['old_resolved'], aged['old_rejected']}
+    assert orphans == 0
+
+def test_archived_complaints_round_trip(aged):
+    before = {c['complaint_id']: c for c in db.get_complaints_by_student('1001')}
+    threads_before = db.get_threads(list(before))
+    db.archive_closed_complaints(older_than_days=180)
+    assert len(db.get_complaints_by_student('1001')) == 2
+    after = {c['complaint_id']: c for c in db.get_complaints_by_student('1001', include_archived=True)}
+    assert set(after) == set(before)
+    for complaint_id, row in after.items():
+        assert row['archived'] == (complaint_id in (aged['old_resolved'], aged['old_rejected']))
+        assert {key: row[key] for key in db.ARCHIVE_TABLES[0][2]} == {key: before[complaint_id][key] for key in db.ARCHIVE_TABLES[0][2]}
+    threads_after = db.get_threads(list(before), include_archived=True)
+    for complaint_id in before:
+        assert [m['message_text'] for m in threads_after[complaint_id]['messages']] == [m['message_text'] for m in threads_before[complaint_id]['messages']]
+        assert [u['note_text'] for u in threads_after[complaint_id]['updates']] == [u['note_text'] for u in threads_before[complaint_id]['updates']]
+
+def test_archive_is_repeatable_in_batches(aged):
+    assert db.archive_closed_complaints(older_than_days=180, batch_size=1)['complaints'] == 2
+    assert db.archive_closed_complaints(older_than_days=180)['complaints'] == 0
+
+def test_search_includes_archived_when_asked(aged):
+    db.archive_closed_complaints(older_than_days=180)
+    hits = db.search_complaints('marks missing', include_archived=True)
+    assert {(hit['complaint_id'], hit['archived']) for hit in hits if hit['source'] == 'complaint'} >= {(aged['old_resolved'], 1)}
+    assert aged['old_resolved'] not in {hit['complaint_id'] for hit in db.search_complaints('marks missing')}
+
+def test_archive_search_requires_every_token(aged):
+    db.archive_closed_complaints(older_than_days=180)
+    with db.connection() as conn:
+        assert [r['complaint_id'] for r in db._search_archive(conn, 'portal ML', 10)] == [aged['old_resolved']]
+        assert db._search_archive(conn, 'portal Java', 10) == []
+        assert [r['message_id'] is not None for r in db._search_archive(conn, 'follow-up old_rejected', 10)] == [True]
+        assert [r['source'] for r in db._search_archive(conn, '%_', 10)] == ['message', 'message']
+
+def test_negative_age_is_rejected(aged):
+    with pytest.raises(ValueError):
+        db.archive_closed_complaints(older_than_days=-1)
@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+import time
+import pytest
+import backup
+import db
+
+def count_complaints(path):
+    conn = sqlite3.connect(str(path))
+    try:
+        assert conn.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+        return conn.execute('SELECT COUNT(*) FROM complaints').fetchone()[0]
+    finally:
+        conn.close()
+
+@pytest.fixture
+def seeded(fresh_db):
+    for i in range(200):
+        db.add_complaint(f's{i % 7}', 'x' * 500)
+    return fresh_db
+
+def test_backup_copies_database(seeded, tmp_path):
+    dest = tmp_path / 'out' / 'copy.sqlite3'
+    progress = []
+    report = backup.backup_database(dest, pages=4, sleep=0, progress=progress.append)
+    assert dest.exists() and not dest.with_name(dest.name + '.part').exists()
+    assert count_complaints(dest) == 200
+    assert report['dest'] == str(dest) and report['bytes'] == dest.stat().st_size
+    assert report['pages_copied'] == report['pages_total'] > 0
+    assert len(progress) > 1 and progress[-1]['percent'] == 100.0
+
+def test_backup_is_consistent_under_writes(seeded, tmp_path):
+    dest = tmp_path / 'copy.sqlite3'
+    stop = threading.Event()
+    written = []
+
+    def writer():
+        while not stop.is_set():
+            written.append(db.add_complaint('writer', 'y' * 500))
+            time.sleep(0.001)
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        backup.backup_database(dest, pages=1, sleep=0.002)
+    finally:
+        stop.set()
+        t.join()
+    assert written
+    assert 200 <= count_complaints(dest) <= 200 + len(written)
+
+def test_backup_missing_database(fresh_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', tmp_path / 'missing.sqlite3')
+    with pytest.raises(FileNotFoundError):
+        backup.backup_database(tmp_path / 'copy.sqlite3')
+
+def test_start_backup_reports_status(seeded, tmp_path):
+    dest = tmp_path / 'bg.sqlite3'
+    assert backup.start_backup(dest, pages=2, sleep=0.01)
+    assert not backup.start_backup(dest)
+    backup._backup_thread.join(timeout=30)
+    status = backup.backup_status()
+    assert status['state'] == 'done' and status['dest'] == str(dest)
+    assert count_complaints(dest) == 200
+
+def test_cli_writes_backup(seeded, tmp_path, capsys):
+    dest = tmp_path / 'cli.sqlite3'
+    assert backup.main([str(dest), '--pages', '8', '--sleep', '0']) == 0
+    out = capsys.readouterr().out
+    assert out.startswith(f'backup={dest} bytes=')
+    assert count_complaints(dest) == 200
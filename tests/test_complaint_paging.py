@@ -0,0 +1,51 @@
+import pytest
+import db
+
+@pytest.fixture
+def complaints(fresh_db):
+    ids = [db.add_complaint(f'student{i % 3}', f'complaint {i}', category) for i, category in enumerate(['Marks Mismatch', 'Missing Grade'] * 12)]
+    with db.transaction() as conn:
+        for i, complaint_id in enumerate(ids):
+            conn.execute("UPDATE complaints SET created_at = datetime('2025-01-01', ?), status = ? WHERE complaint_id = ?", (f'+{i // 4} days', 'Resolved' if i % 5 == 0 else 'Pending', complaint_id))
+    return ids
+
+def expected_order(sort: str, where: str='1', params=()):
+    direction = db.COMPLAINT_SORTS[sort]
+    with db.connection() as conn:
+        return [r[0] for r in conn.execute(f'SELECT complaint_id FROM complaints WHERE {where} ORDER BY created_at {direction}, complaint_id {direction}', params)]
+
+def collect_pages(page_size: int, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        page = db.get_complaints_page(cursor=cursor, page_size=page_size, **kwargs)
+        pages.append([row['complaint_id'] for row in page['items']])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+@pytest.mark.parametrize('sort', sorted(db.COMPLAINT_SORTS))
+@pytest.mark.parametrize('page_size', [1, 5, 7, 24, 50])
+def test_pages_cover_every_row_once_in_order(complaints, sort, page_size):
+    pages = collect_pages(page_size, sort=sort)
+    assert [complaint_id for page in pages for complaint_id in page] == expected_order(sort)
+    assert all((len(page) == page_size for page in pages[:-1]))
+
+def test_last_full_page_has_no_cursor(complaints):
+    page = db.get_complaints_page(page_size=len(complaints))
+    assert len(page['items']) == len(complaints)
+    assert page['next_cursor'] is None
+
+def test_paging_with_filters(complaints):
+    pages = collect_pages(4, filters={'student_username': 'student1', 'exclude': {'status': ['Resolved']}})
+    assert [complaint_id for page in pages for complaint_id in page] == expected_order('newest', "student_username = 'student1' AND status <> 'Resolved'")
+
+def test_rows_inserted_ahead_of_cursor_do_not_shift_pages(complaints):
+    first = db.get_complaints_page(page_size=5)
+    db.add_complaint('student9', 'new complaint while paging')
+    second = db.get_complaints_page(cursor=first['next_cursor'], page_size=5)
+    assert [row['complaint_id'] for row in second['items']] == expected_order('newest')[6:11]
+
+def test_unknown_sort_is_rejected(fresh_db):
+    with pytest.raises(ValueError):
+        db.get_complaints_page(sort='random')
@@ -0,0 +1,60 @@
+import pytest
+import db
+
+def grouped_truth():
+    truth = {}
+    with db.connection() as conn:
+        for table, sources in (('complaints', ('complaints', 'complaints_archive')), ('results', ('results',))):
+            for metric, key, condition in db.COUNTER_DIMENSIONS[table]:
+                union = ' UNION ALL '.join((f"SELECT {key.format(row=source)} AS key FROM {source} WHERE {(condition.format(row=source) if condition else '1')}" for source in sources))
+                truth[metric] = {r[0]: r[1] for r in conn.execute(f'SELECT key, COUNT(*) FROM ({union}) GROUP BY key')}
+    for metric in ('complaints_total', 'results_total'):
+        truth[metric] = truth[metric].get('', 0)
+    return truth
+
+def seed(n: int=30):
+    ids = []
+    for i in range(n):
+        ids.append(db.add_complaint(f'student{i % 4}', f'complaint {i}', predicted_category=['Marks Mismatch', 'Missing Grade', None][i % 3], course_code=f'ITPC{i % 5}04' if i % 6 else None, duplicate_reference=ids[0] if ids and i % 7 == 0 else None))
+    for i in range(12):
+        db.add_result(f'student{i % 4}', f'ITPC{i % 3}04', 'Course', '4', str(i * 7), db.RESULT_STATUSES[i % 3])
+    return ids
+
+def test_counters_match_group_by_after_inserts(fresh_db):
+    seed()
+    assert db.get_dashboard_summary() == grouped_truth()
+
+def test_counters_follow_updates_and_deletes(fresh_db):
+    ids = seed()
+    for complaint_id in ids[::3]:
+        db.update_complaint_status(complaint_id, 'In Progress')
+    for complaint_id in ids[1::4]:
+        db.update_complaint_category(complaint_id, 'Calculation Discrepancy', 0.9)
+    for complaint_id in ids[2::5]:
+        db.delete_complaint(complaint_id)
+    db.add_result('student0', 'ITPC004', 'Course', '4', '99', 'Pass')
+    with db.transaction() as conn:
+        conn.execute("UPDATE complaints SET created_at = datetime(created_at, '-3 days'), duplicate_reference = NULL WHERE complaint_id % 2 = 0")
+        conn.execute("DELETE FROM results WHERE status = 'Backlog'")
+    assert db.get_dashboard_summary() == grouped_truth()
+
+def test_counters_keep_archived_complaints(fresh_db):
+    ids = seed()
+    for complaint_id in ids[:10]:
+        db.update_complaint_status(complaint_id, 'Resolved')
+    with db.transaction() as conn:
+        conn.execute("UPDATE complaints SET created_at = datetime('now', '-400 days') WHERE status = 'Resolved'")
+    before = db.get_dashboard_summary()
+    moved = db.archive_closed_complaints(older_than_days=180)
+    assert moved['complaints'] == 10
+    assert db.get_dashboard_summary() == before == grouped_truth()
+
+def test_rolled_back_writes_leave_counters_alone(fresh_db):
+    seed()
+    before = db.get_dashboard_summary()
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO complaints (student_username, text, status) VALUES ('s', 't', 'Pending')")
+            conn.execute("UPDATE complaints SET status = 'Rejected'")
+            raise RuntimeError('boom')
+    assert db.get_dashboard_summary() == before
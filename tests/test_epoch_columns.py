@@ -0,0 +1,45 @@
+import time
+from datetime import date, datetime, timezone
+import pytest
+import db
+
+@pytest.fixture
+def aged(fresh_db):
+    now = int(time.time())
+    ids = {}
+    for name, status, age_days in (('fresh_open', 'Pending', 1), ('stale_open', 'Pending', 10), ('stale_progress', 'In Progress', 30), ('stale_resolved', 'Resolved', 30), ('stale_rejected', 'Rejected', 10)):
+        complaint_id = db.add_complaint('s1', name)
+        db.update_complaint_status(complaint_id, status)
+        with db.transaction() as conn:
+            conn.execute("UPDATE complaints SET created_at = datetime(?, 'unixepoch') WHERE complaint_id = ?", (now - age_days * 86400, complaint_id))
+        ids[name] = complaint_id
+    return ids
+
+def test_created_epoch_follows_created_at(aged):
+    with db.connection() as conn:
+        mismatched = conn.execute("SELECT COUNT(*) FROM complaints WHERE created_epoch IS NOT CAST(strftime('%s', created_at) AS INTEGER)").fetchone()[0]
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute("INSERT INTO complaints (student_username, text, created_at) VALUES ('s2', 'inserted without epoch', '2024-03-01 12:00:00')")
+        inserted = conn.execute("SELECT created_epoch FROM complaints WHERE text = 'inserted without epoch'").fetchone()[0]
+        conn.rollback()
+    assert mismatched == 0
+    assert inserted == int(datetime(2024, 3, 1, 12, tzinfo=timezone.utc).timestamp())
+
+def test_open_complaints_older_than(aged):
+    stale = [c['complaint_id'] for c in db.get_open_complaints_older_than(7)]
+    assert stale == [aged['stale_progress'], aged['stale_open']]
+    assert db.count_open_complaints_older_than(7) == 2
+    assert db.count_open_complaints_older_than(20) == 1
+    assert db.count_open_complaints_older_than(0) == 3
+
+def test_open_count_uses_partial_index(aged):
+    db.reset_query_stats()
+    db.count_open_complaints_older_than(7)
+    plan = [s for s in db.get_query_stats()['statements'] if s['sql'].startswith('SELECT COUNT(*) FROM complaints WHERE status NOT IN')][0]['plan']
+    assert any(('idx_complaints_open_epoch' in step for step in plan))
+
+def test_count_complaints_between(aged):
+    now = int(time.time())
+    assert db.count_complaints_between(now - 20 * 86400, now) == 3
+    assert db.count_complaints_between(date(2000, 1, 1), datetime.now(timezone.utc).isoformat()) == 5
+    assert db.count_complaints_between('2000-01-01', '2000-01-02') == 0
@@ -0,0 +1,82 @@
+import sqlite3
+import pytest
+import db
+from .test_counters import grouped_truth
+BASELINE_SCHEMA = ("CREATE TABLE users (user_id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL, password_hash TEXT NOT NULL, role TEXT NOT NULL CHECK(role IN ('student','admin')), created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)", "CREATE TABLE complaints (complaint_id INTEGER PRIMARY KEY AUTOINCREMENT, student_username TEXT NOT NULL, text TEXT NOT NULL, predicted_category TEXT, confidence REAL, status TEXT NOT NULL DEFAULT 'Pending', file_path TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY(student_username) REFERENCES users(username))", "CREATE TABLE results (result_id INTEGER PRIMARY KEY AUTOINCREMENT, student_username TEXT NOT NULL, course_code TEXT NOT NULL, course_name TEXT, semester TEXT, marks TEXT, status TEXT CHECK(status IN ('Pass','Fail','Backlog')) DEFAULT 'Pass', uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY(student_username) REFERENCES users(username))", 'CREATE TABLE resolution_updates (update_id INTEGER PRIMARY KEY AUTOINCREMENT, complaint_id INTEGER NOT NULL, admin_username TEXT NOT NULL, note_text TEXT, file_paths TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY(complaint_id) REFERENCES complaints(complaint_id), FOREIGN KEY(admin_username) REFERENCES users(username))', "CREATE TABLE complaint_messages (message_id INTEGER PRIMARY KEY AUTOINCREMENT, complaint_id INTEGER NOT NULL, sender_username TEXT NOT NULL, sender_role TEXT NOT NULL CHECK(sender_role IN ('student', 'admin')), message_text TEXT, file_paths TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY(complaint_id) REFERENCES complaints(complaint_id), FOREIGN KEY(sender_username) REFERENCES users(username))", 'CREATE INDEX idx_results_student ON results(student_username)', 'CREATE INDEX idx_complaints_student ON complaints(student_username)', 'CREATE INDEX idx_resolution_complaint ON resolution_updates(complaint_id)', 'CREATE INDEX idx_messages_complaint ON complaint_messages(complaint_id)', 'ALTER TABLE complaints ADD COLUMN course_code TEXT', 'ALTER TABLE complaints ADD COLUMN semester TEXT', 'ALTER TABLE complaints ADD COLUMN duplicate_reference INTEGER')
+
+@pytest.fixture
+def baseline_db(tmp_path, monkeypatch):
+    db.close_pool()
+    path = tmp_path / 'baseline.sqlite3'
+    conn = sqlite3.connect(path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT INTO users (username, password_hash, role) VALUES ('1001', 'x', 'student')")
+    conn.executemany("INSERT INTO complaints (student_username, text, predicted_category, status, created_at, course_code) VALUES (?, ?, ?, ?, ?, ?)", [('1001', 'marks missing for ML', 'Missing Grade', 'Pending', '2024-01-05 10:00:00', 'ITPC204'), ('1001', 'absent marked wrongly', 'Absentee Error', 'Resolved', '2024-02-01 09:30:00', None), ('1002', 'total is wrong', None, 'In Progress', '2024-03-10 12:00:00', 'ITPC304')])
+    conn.execute("INSERT INTO complaint_messages (complaint_id, sender_username, sender_role, message_text) VALUES (1, '1001', 'student', 'any update on the ML marks?')")
+    conn.executemany('INSERT INTO results (student_username, course_code, course_name, semester, marks, status) VALUES (?, ?, ?, ?, ?, ?)', [('1001', 'ITPC204', 'ML', '4', '40', 'Fail'), ('1001', 'ITPC204', 'ML', '4', '56', 'Pass'), ('1,002', 'ITPC304', 'Java', '4', '70', 'Pass'), ('1003', 'ITPC404', 'DSA', None, '12', 'Backlog')])
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db, 'DB_PATH', path)
+    yield path
+    db.stop_writer()
+    db.close_pool()
+
+def test_baseline_db_migrates_to_latest(baseline_db):
+    db.init_db()
+    assert db.schema_version() == len(db.MIGRATIONS)
+    with db.connection() as conn:
+        results = {(r['student_username'], r['course_code']): r['marks'] for r in conn.execute('SELECT * FROM results')}
+        epochs = conn.execute("SELECT COUNT(*) FROM complaints WHERE created_epoch = CAST(strftime('%s', created_at) AS INTEGER)").fetchone()[0]
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert results == {('1001', 'ITPC204'): '56', ('1002', 'ITPC304'): '70', ('1003', 'ITPC404'): '12'}
+    assert epochs == 3
+    assert {'dashboard_counters', 'complaints_archive', 'sessions'} <= tables
+    assert db.get_dashboard_summary() == grouped_truth()
+
+def test_newer_clean_row_beats_older_comma_row(baseline_db):
+    with sqlite3.connect(baseline_db) as conn:
+        conn.execute("INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_at) VALUES ('2,001', 'ITPC204', 'ML', '4', '40', 'Fail', '2024-01-15 10:00:00')")
+        conn.execute("INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_at) VALUES ('2001', 'ITPC204', 'ML', '4', '56', 'Pass', '2024-06-15 10:00:00')")
+        conn.execute("INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_at) VALUES ('2002', 'ITPC204', 'ML', '4', '30', 'Fail', '2024-01-15 10:00:00')")
+        conn.execute("INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_at) VALUES (' 2,002', 'ITPC204', 'ML', '4', '61', 'Pass', '2024-06-15 10:00:00')")
+    db.init_db()
+    assert [(r['marks'], r['status']) for r in db.get_results_by_student('2001')] == [('56', 'Pass')]
+    assert [(r['marks'], r['status']) for r in db.get_results_by_student('2002')] == [('61', 'Pass')]
+
+def test_fix_commas_keeps_newest_row(baseline_db):
+    db.init_db()
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO results (student_username, course_code, course_name, semester, marks, status, uploaded_at) VALUES ('1,001', 'ITPC204', 'ML', '4', '12', 'Fail', '2020-01-01 00:00:00')")
+        conn.execute("INSERT INTO results (student_username, course_code, course_name, semester, marks, status) VALUES ('1,003', 'ITPC504', 'OS', '4', '77', 'Pass')")
+    report = db.fix_student_username_commas()
+    assert report['updated'] == 1
+    assert [r['marks'] for r in db.get_results_by_student('1001')] == ['56']
+    assert sorted((r['course_code'] for r in db.get_results_by_student('1003'))) == ['ITPC404', 'ITPC504']
+    assert db.get_dashboard_summary() == grouped_truth()
+
+def test_migrated_db_keeps_data_usable(baseline_db):
+    db.init_db()
+    assert [c['complaint_id'] for c in db.get_complaints_page(page_size=10)['items']] == [3, 2, 1]
+    assert db.get_results_by_student('1,002')[0]['marks'] == '70'
+    if db.fts_enabled():
+        assert [hit['complaint_id'] for hit in db.search_complaints('ML marks')] == [1, 1]
+    complaint_id = db.add_complaint('1001', 'new complaint after migration')
+    assert db.get_complaints_by_student('1001')[0]['complaint_id'] == complaint_id
+    assert db.get_dashboard_summary() == grouped_truth()
+
+def test_init_db_is_idempotent(baseline_db):
+    db.init_db()
+    summary = db.get_dashboard_summary()
+    db.init_db()
+    assert db.schema_version() == len(db.MIGRATIONS)
+    assert db.get_dashboard_summary() == summary
+
+def test_partially_migrated_db_resumes(baseline_db):
+    with sqlite3.connect(baseline_db) as conn:
+        for migration in db.MIGRATIONS[:4]:
+            migration(conn.cursor())
+        conn.execute('PRAGMA user_version = 4')
+    db.init_db()
+    assert db.schema_version() == len(db.MIGRATIONS)
+    assert db.get_dashboard_summary() == grouped_truth()
@@ -0,0 +1,78 @@
+import threading
+import numpy as np
+import pytest
+pytest.importorskip('joblib')
+pd = pytest.importorskip('pandas')
+import model_loader
+import vector_index
+
+class FakeEncoder:
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        return np.array([[float(len(text)), 1.0, 0.0] for text in texts], dtype=np.float32)
+
+def clear_registry():
+    clear = getattr(model_loader.get_registry, 'cache_clear', None) or model_loader.get_registry.clear
+    clear()
+
+def install_loaders(registry, fail=False):
+    texts = ['marks missing', 'absent marked wrongly in the final exam']
+    frame = pd.DataFrame({'Complaint Text': texts, 'Complaint Type': ['Missing Grade', 'Absentee Error'], 'Resolution Description': ['fixed', 'corrected'], 'Complaint Resolution Time': [3, 5]})
+
+    def embeddings():
+        if fail:
+            raise RuntimeError('embedding cache unavailable')
+        return vector_index.normalize_rows(FakeEncoder().encode(texts))
+    loaders = {'sbert': FakeEncoder, 'resolved_complaints': lambda: frame, 'embeddings': embeddings, 'similarity_index': lambda: vector_index.ExactIndex.build(registry.get('embeddings'), normalized=True)}
+    for name, loader in loaders.items():
+        registry.artifacts[name].loader = loader
+
+def warm(registry):
+    assert model_loader.start_warmup()
+    registry.warmup_thread.join(timeout=10)
+    return model_loader.similarity_status()
+
+@pytest.fixture
+def registry():
+    clear_registry()
+    registry = model_loader.get_registry()
+    install_loaders(registry)
+    yield registry
+    clear_registry()
+
+def test_warmup_makes_similarity_ready(registry):
+    assert model_loader.similarity_status() == 'idle'
+    assert warm(registry) == 'ready'
+    assert not model_loader.start_warmup()
+    results = model_loader.find_similar_complaint('marks missing', top_k=1)
+    assert results.status == 'ready'
+    assert results[0]['complaint_type'] == 'Missing Grade'
+
+def test_not_ready_results_are_marked(registry):
+    release = threading.Event()
+    registry.artifacts['similarity_index'].loader = lambda: release.wait(10) and vector_index.ExactIndex.build(registry.get('embeddings'), normalized=True)
+    results = model_loader.find_similar_complaint('marks missing')
+    assert results == [] and results.status == 'loading'
+    release.set()
+    registry.warmup_thread.join(timeout=10)
+    assert model_loader.find_similar_complaint('marks missing').status == 'ready'
+
+def test_failed_warmup_is_reported_and_retried(registry):
+    install_loaders(registry, fail=True)
+    assert warm(registry) == 'failed'
+    assert not model_loader.similarity_ready()
+    assert model_loader.find_similar_complaint('marks missing').status == 'failed'
+    assert not model_loader.start_warmup()
+    install_loaders(registry)
+    registry.warmup_failed_at -= model_loader.WARMUP_RETRY_SECONDS
+    assert warm(registry) == 'ready'
+
+def test_cleared_registry_can_warm_up_again(registry):
+    assert warm(registry) == 'ready'
+    clear_registry()
+    fresh = model_loader.get_registry()
+    assert fresh is not registry
+    install_loaders(fresh)
+    assert model_loader.similarity_status() == 'idle'
+    assert model_loader.warmup_status()['state'] == 'idle'
+    assert warm(fresh) == 'ready'
@@ -0,0 +1,62 @@
+import threading
+import pytest
+import db
+
+def complaint_count() -> int:
+    with db.connection() as conn:
+        return conn.execute('SELECT COUNT(*) FROM complaints').fetchone()[0]
+
+def test_transaction_commits(fresh_db):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO complaints (student_username, text) VALUES ('s1', 'marks missing')")
+    assert complaint_count() == 1
+
+def test_transaction_rolls_back_on_error(fresh_db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO complaints (student_username, text) VALUES ('s1', 'marks missing')")
+            raise RuntimeError('boom')
+    assert complaint_count() == 0
+
+def test_nested_transaction_joins_outer(fresh_db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as outer:
+            outer.execute("INSERT INTO complaints (student_username, text) VALUES ('s1', 'first')")
+            with db.transaction() as inner:
+                assert inner is outer
+                inner.execute("INSERT INTO complaints (student_username, text) VALUES ('s1', 'second')")
+            raise RuntimeError('boom')
+    assert complaint_count() == 0
+
+def test_connection_returns_to_pool_without_open_transaction(fresh_db):
+    with db.connection() as first:
+        first.execute('BEGIN IMMEDIATE')
+        first.execute("INSERT INTO complaints (student_username, text) VALUES ('s1', 'left open')")
+    with db.connection() as second:
+        assert second is first
+        assert not second.in_transaction
+    assert complaint_count() == 0
+
+def test_connection_is_reentrant_within_thread(fresh_db):
+    with db.connection() as outer:
+        with db.connection() as inner:
+            assert inner is outer
+
+def test_threads_get_separate_connections(fresh_db):
+    seen = {}
+    barrier = threading.Barrier(2)
+
+    def worker(name):
+        with db.connection() as conn:
+            seen[name] = conn
+            barrier.wait()
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert seen['a'] is not seen['b']
+
+def test_connections_use_wal(fresh_db):
+    with db.connection() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
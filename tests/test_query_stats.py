@@ -0,0 +1,47 @@
+import pytest
+import db
+
+@pytest.fixture
+def stats_db(fresh_db):
+    for i in range(20):
+        db.add_complaint(f's{i % 3}', f'complaint {i}', predicted_category='Missing Grade', course_code=f'ITPC{i % 4}04')
+    db.reset_query_stats()
+    yield fresh_db
+    db.reset_query_stats()
+
+def statement(fragment: str):
+    matches = [s for s in db.get_query_stats()['statements'] if fragment in s['sql']]
+    assert matches, fragment
+    return matches[0]
+
+def test_cte_facet_scan_is_not_a_full_scan(stats_db):
+    assert db.get_complaint_facets()['course_code'] == ['ITPC004', 'ITPC104', 'ITPC204', 'ITPC304']
+    facet = statement('WITH RECURSIVE facet')
+    assert any((step.startswith('SCAN facet') for step in facet['plan']))
+    assert not facet['full_scan']
+
+def test_unindexed_table_scan_is_flagged(stats_db):
+    with db.connection() as conn:
+        conn.execute('SELECT complaint_id FROM complaints WHERE text LIKE ?', ('%7%',)).fetchall()
+        conn.execute('SELECT c.complaint_id FROM complaints AS c WHERE c.confidence IS NULL').fetchall()
+        conn.execute('SELECT complaint_id FROM complaints WHERE student_username = ?', ('s1',)).fetchall()
+    assert statement('WHERE text LIKE')['full_scan']
+    assert statement('FROM complaints AS c')['full_scan']
+    assert not statement('WHERE student_username = ?')['full_scan']
+
+def test_subquery_scans_are_not_flagged(stats_db):
+    db.add_result('s1', 'ITPC204', 'ML', '4', '50', 'Pass')
+    db.get_latest_results_for_students(['s1', 's2'])
+    latest = statement('ROW_NUMBER() OVER')
+    assert not latest['full_scan']
+
+def test_statement_stats_are_capped(stats_db, monkeypatch):
+    monkeypatch.setattr(db, 'QUERY_STATS_MAX_STATEMENTS', 5)
+    with db.connection() as conn:
+        for _ in range(3):
+            conn.execute('SELECT COUNT(*) FROM complaints').fetchone()
+        for i in range(20):
+            conn.execute(f'SELECT {i} FROM complaints LIMIT 1').fetchall()
+    statements = db.get_query_stats()['statements']
+    assert len(statements) <= 5
+    assert statement('SELECT COUNT(*) FROM complaints')['calls'] == 3
@@ -0,0 +1,43 @@
+import pandas as pd
+import db
+
+def results_frame(rows):
+    return pd.DataFrame(rows, columns=['student_username', 'course_code', 'course_name', 'semester', 'marks', 'status'])
+
+def stored_results():
+    with db.connection() as conn:
+        return {(r['student_username'], r['course_code'], r['semester']): (r['marks'], r['status']) for r in conn.execute('SELECT * FROM results')}
+
+def test_import_counts_inserts(fresh_db):
+    report = db.import_results_from_dataframe(results_frame([('1001', 'ITPC204', 'ML', '4', '56', 'Pass'), ('1002', 'ITPC204', 'ML', '4', '23', 'Fail'), ('1001', 'ITPC304', 'Java', '4', '70', 'Pass')]))
+    assert (report['inserted'], report['updated'], report['unchanged'], report['errors']) == (3, 0, 0, 0)
+    assert len(stored_results()) == 3
+
+def test_reimport_is_unchanged(fresh_db):
+    frame = results_frame([('1001', 'ITPC204', 'ML', '4', '56', 'Pass'), ('1002', 'ITPC204', 'ML', '4', '23', 'Fail')])
+    db.import_results_from_dataframe(frame)
+    report = db.import_results_from_dataframe(frame)
+    assert (report['inserted'], report['updated'], report['unchanged'], report['errors']) == (0, 0, 2, 0)
+
+def test_import_mixes_insert_update_unchanged_and_errors(fresh_db):
+    db.import_results_from_dataframe(results_frame([('1001', 'ITPC204', 'ML', '4', '56', 'Pass'), ('1002', 'ITPC204', 'ML', '4', '23', 'Fail')]))
+    report = db.import_results_from_dataframe(results_frame([('1001', 'ITPC204', 'ML', '4', '56', 'Pass'), ('1002', 'ITPC204', 'ML', '4', '41', 'Pass'), ('1003', 'ITPC204', 'ML', '4', '12', 'Fail'), ('1004', 'ITPC204', 'ML', '4', '50', 'Excellent'), ('', 'ITPC204', 'ML', '4', '50', 'Pass')]))
+    assert (report['inserted'], report['updated'], report['unchanged'], report['errors']) == (1, 1, 1, 2)
+    assert sorted(report['error_rows']['row']) == [3, 4]
+    assert stored_results()[('1002', 'ITPC204', '4')] == ('41', 'Pass')
+
+def test_import_keys_on_normalized_username_and_semester(fresh_db):
+    db.import_results_from_dataframe(results_frame([('1001', 'ITPC204', 'ML', '4', '56', 'Pass'), ('1001', 'ITPC204', 'ML', None, '60', 'Pass')]))
+    report = db.import_results_from_dataframe(results_frame([(' 1,001 ', 'ITPC204', 'ML', '4', '58', 'Pass')]))
+    assert (report['inserted'], report['updated']) == (0, 1)
+    assert stored_results() == {('1001', 'ITPC204', '4'): ('58', 'Pass'), ('1001', 'ITPC204', None): ('60', 'Pass')}
+
+def test_import_upserts_within_one_frame(fresh_db):
+    report = db.import_results_from_dataframe(results_frame([('1001', 'ITPC204', 'ML', '4', '10', 'Fail'), ('1001', 'ITPC204', 'ML', '4', '60', 'Pass')]), chunk_size=1)
+    assert report['inserted'] == 1
+    assert stored_results() == {('1001', 'ITPC204', '4'): ('60', 'Pass')}
+
+def test_add_result_upserts(fresh_db):
+    db.add_result('1001', 'ITPC204', 'ML', '4', '56', 'Pass')
+    db.add_result('1,001', 'ITPC204', 'ML', '4', '30', 'Fail')
+    assert stored_results() == {('1001', 'ITPC204', '4'): ('30', 'Fail')}
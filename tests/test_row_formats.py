@@ -0,0 +1,59 @@
+import pytest
+import db
+
+@pytest.fixture
+def complaints(fresh_db):
+    for i in range(5):
+        db.add_complaint(f's{i % 2}', f'complaint {i}', predicted_category='Grading', confidence=0.5 + i / 10, course_code='CS101', semester='Fall')
+
+def test_compact_rows_match_dict_rows(complaints):
+    dict_rows = db.get_all_complaints(limit=10)
+    compact_rows = db.get_all_complaints(limit=10, row_format='compact')
+    assert len(compact_rows) == len(dict_rows) == 5
+    for d, c in zip(dict_rows, compact_rows):
+        assert c.to_dict() == d
+        assert list(c.keys()) == list(d.keys())
+        assert dict(c.items()) == d
+        assert tuple(c.values()) == tuple(d.values())
+        for key, value in d.items():
+            assert c.get(key) == c[key] == getattr(c, key) == value
+            assert key in c
+        assert c[0] == d['complaint_id']
+        assert c.get('missing') is None
+        assert c.get('missing', 'x') == 'x'
+        assert 'missing' not in c
+        with pytest.raises(KeyError):
+            c['missing']
+
+def test_compact_row_class_is_cached(complaints):
+    a = db.get_all_complaints(limit=10, row_format='compact')
+    b = db.get_complaints_by_student('s0', row_format='compact')
+    assert type(a[0]) is type(b[0])
+
+def test_columnar_rows_match_dict_rows(complaints):
+    dict_rows = db.get_all_complaints(limit=10)
+    columns = db.get_all_complaints(limit=10, row_format='columnar')
+    assert list(columns) == list(dict_rows[0])
+    for key, values in columns.items():
+        assert values == [row[key] for row in dict_rows]
+
+def test_page_items_follow_row_format(complaints):
+    dict_page = db.get_complaints_page(page_size=3)
+    compact_page = db.get_complaints_page(page_size=3, row_format='compact')
+    columnar_page = db.get_complaints_page(page_size=3, row_format='columnar')
+    assert dict_page['next_cursor'] == compact_page['next_cursor'] == columnar_page['next_cursor'] is not None
+    assert [row.to_dict() for row in compact_page['items']] == dict_page['items']
+    assert columnar_page['items']['complaint_id'] == [row['complaint_id'] for row in dict_page['items']]
+
+@pytest.mark.parametrize('row_format, expected', [('dict', []), ('compact', [])])
+def test_empty_result_rows(fresh_db, row_format, expected):
+    assert db.get_complaints_by_student('nobody', row_format=row_format) == expected
+
+def test_empty_result_columnar_keeps_columns(fresh_db):
+    columns = db.get_complaints_by_student('nobody', row_format='columnar')
+    assert columns and all((values == [] for values in columns.values()))
+    assert 'complaint_id' in columns
+
+def test_unknown_row_format(complaints):
+    with pytest.raises(ValueError):
+        db.get_all_complaints(row_format='tuple')
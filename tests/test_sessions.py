@@ -0,0 +1,46 @@
+import pytest
+import db
+
+@pytest.fixture
+def user(fresh_db):
+    assert db.create_user('1001', 'secret')
+    return db.get_user_by_username('1001')
+
+def test_authenticate_returns_user_without_hash(user):
+    assert db.authenticate('1001', 'secret') == user
+    assert db.authenticate('1001', 'wrong') is None
+    assert db.authenticate('nobody', 'secret') is None
+    assert db.verify_user('1001', 'secret')
+
+def test_session_round_trip(user):
+    token = db.create_session('1001')
+    assert db.get_session_user(token) == user
+    db.delete_session(token)
+    assert db.get_session_user(token) is None
+
+def test_sessions_store_only_token_hash(user):
+    token = db.create_session('1001')
+    with db.connection() as conn:
+        stored = [r[0] for r in conn.execute('SELECT token_hash FROM sessions')]
+    assert stored == [db._token_hash(token)]
+    assert token not in stored
+
+def test_sessions_are_independent(user):
+    first = db.create_session('1001')
+    second = db.create_session('1001')
+    assert first != second
+    db.delete_session(first)
+    assert db.get_session_user(second) == user
+
+def test_expired_session_is_rejected_and_purged(user):
+    expired = db.create_session('1001', ttl_seconds=-1)
+    assert db.get_session_user(expired) is None
+    db.create_session('1001')
+    with db.connection() as conn:
+        hashes = {r[0] for r in conn.execute('SELECT token_hash FROM sessions')}
+    assert db._token_hash(expired) not in hashes
+
+@pytest.mark.parametrize('token', ['', None, 'not-a-real-token'])
+def test_unknown_tokens_are_rejected(user, token):
+    db.create_session('1001')
+    assert db.get_session_user(token) is None
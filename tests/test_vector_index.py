@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import vector_index
+
+def clustered(n_rows: int=6000, dim: int=32, seed: int=0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_rows // 50, dim)).astype(np.float32)
+    return (centers[rng.integers(0, len(centers), n_rows)] + 0.5 * rng.standard_normal((n_rows, dim)).astype(np.float32)) * 3.0
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.argsort(normalized @ (query / np.linalg.norm(query)))[::-1][:k]
+
+def recall(index, vectors: np.ndarray, queries: np.ndarray, k: int=10) -> float:
+    hits = sum((len(np.intersect1d(exact_top_k(vectors, q, k), index.search(q, k)[0])) for q in queries))
+    return hits / (k * len(queries))
+
+@pytest.fixture(scope='module')
+def vectors():
+    return clustered()
+
+@pytest.fixture(scope='module')
+def queries(vectors):
+    rng = np.random.default_rng(1)
+    return vectors[rng.choice(len(vectors), 50, replace=False)] + rng.normal(0.0, 0.3, (50, vectors.shape[1])).astype(np.float32)
+
+def test_exact_index_matches_brute_force(vectors, queries):
+    index = vector_index.ExactIndex.build(vectors)
+    for query in queries[:10]:
+        ids, scores = index.search(query, 5)
+        assert list(ids) == list(exact_top_k(vectors, query, 5))
+        assert np.all(np.diff(scores) <= 0)
+
+@pytest.mark.parametrize('dtype', vector_index.EMBEDDING_DTYPES)
+def test_ivf_recall_against_exact(vectors, queries, tmp_path, dtype):
+    path = tmp_path / 'embeddings.npy'
+    vector_index.save_embeddings(path, vectors, dtype)
+    index = vector_index.IVFIndex.build(vector_index.load_embeddings(path), normalized=True)
+    assert index.info['recall'] >= vector_index.IVF_TARGET_RECALL or index.n_probe == len(index.centroids)
+    assert recall(index, vectors, queries) >= 0.9
+
+def test_ivf_full_probe_is_exact(vectors, queries):
+    index = vector_index.IVFIndex.build(vectors, n_lists=16)
+    index.n_probe = len(index.centroids)
+    assert recall(index, vectors, queries) == 1.0
+
+def test_saved_index_round_trips_without_extra_files(vectors, queries, tmp_path):
+    path = tmp_path / 'embeddings.npy'
+    vector_index.save_embeddings(path, vectors)
+    base = vector_index.load_embeddings(path)
+    index_path = tmp_path / 'index.npz'
+    built = vector_index.load_or_build_index(base, index_path, 'ivf', normalized=True)
+    loaded = vector_index.load_index(index_path, base, 'ivf', normalized=True)
+    assert sorted((p.name for p in tmp_path.iterdir())) == ['embeddings.npy', 'index.npz']
+    assert loaded.nbytes < base.nbytes
+    for query in queries[:10]:
+        assert list(loaded.search(query, 5)[0]) == list(built.search(query, 5)[0])
+
+def test_stale_index_is_rejected(vectors, tmp_path):
+    index_path = tmp_path / 'index.npz'
+    vector_index.load_or_build_index(vectors, index_path, 'ivf')
+    assert vector_index.load_index(index_path, vectors[:-1], 'ivf') is None
+    changed = vectors.copy()
+    changed[0] += 10.0
+    assert vector_index.load_index(index_path, changed, 'ivf') is None
+    assert vector_index.load_index(index_path, vectors, 'exact') is None
+
+def test_auto_kind_switches_on_size(vectors):
+    assert vector_index.build_index(vectors[:100]).kind == 'exact'
+    assert vector_index.build_index(vectors, 'ivf').kind == 'ivf'
+    with pytest.raises(ValueError):
+        vector_index.build_index(vectors, 'hnsw')
@@ -0,0 +1,106 @@
+import threading
+import pytest
+import db
+QUEUED_WRITES = ('create_user', 'create_session', 'delete_session', 'add_complaint', 'update_complaint_status', '_delete_complaint_rows', 'update_complaint_category', 'add_resolution_update', 'add_complaint_message', 'add_result', 'import_results_from_dataframe', 'insert_sample_results', 'fix_student_username_commas', '_archive_batch')
+
+@pytest.fixture
+def submitted(fresh_db, monkeypatch):
+    calls = []
+    submit_write = db.submit_write
+
+    def spy(func, *args, **kwargs):
+        calls.append(func.__name__)
+        return submit_write(func, *args, **kwargs)
+    monkeypatch.setattr(db, 'submit_write', spy)
+    db.start_writer()
+    yield calls
+    db.stop_writer()
+
+@pytest.mark.parametrize('name', QUEUED_WRITES)
+def test_write_functions_are_queued(name):
+    assert hasattr(getattr(db, name), '__wrapped__')
+
+def test_writes_route_through_writer(submitted):
+    complaint_id = db.add_complaint('s1', 'marks missing')
+    db.update_complaint_status(complaint_id, 'In Progress')
+    db.add_complaint_message(complaint_id, 's1', 'student', 'any news?')
+    db.archive_closed_complaints(older_than_days=0)
+    assert submitted == ['add_complaint', 'update_complaint_status', 'add_complaint_message', '_archive_batch']
+    assert db.get_all_complaints()[0]['status'] == 'In Progress'
+
+def test_queued_write_runs_on_writer_thread(submitted):
+    seen = []
+
+    def record():
+        seen.append(threading.current_thread().name)
+        return 42
+    assert db.submit_write(record).result() == 42
+    assert seen == ['db-writer']
+
+def test_archive_queues_one_write_per_batch(submitted):
+    for i in range(5):
+        db.update_complaint_status(db.add_complaint(f's{i}', f'complaint {i}'), 'Resolved')
+    with db.transaction() as conn:
+        conn.execute("UPDATE complaints SET created_at = datetime('now', '-400 days')")
+    submitted.clear()
+    assert db.archive_closed_complaints(older_than_days=180, batch_size=2)['complaints'] == 5
+    assert submitted == ['_archive_batch'] * 3
+
+@pytest.mark.parametrize('writer', [True, False])
+def test_failed_delete_rolls_back(fresh_db, writer):
+    complaint_id = db.add_complaint('s1', 'keep me whole')
+    db.add_complaint_message(complaint_id, 's1', 'student', 'hello')
+    with db.transaction() as conn:
+        conn.execute("CREATE TRIGGER block_delete BEFORE DELETE ON complaints BEGIN SELECT RAISE(ABORT, 'blocked'); END")
+    if writer:
+        db.start_writer()
+    try:
+        assert db.delete_complaint(complaint_id) is False
+    finally:
+        db.stop_writer()
+    assert len(db.get_complaint_messages(complaint_id)) == 1
+    assert db.count_complaints() == 1
+
+def test_write_inside_transaction_runs_inline(submitted):
+    with db.transaction() as conn:
+        complaint_id = db.add_complaint('s1', 'inside a transaction')
+        db.update_complaint_status(complaint_id, 'Resolved')
+        assert conn.execute('SELECT status FROM complaints WHERE complaint_id = ?', (complaint_id,)).fetchone()[0] == 'Resolved'
+    assert submitted == []
+
+def test_writes_run_inline_without_writer(fresh_db, monkeypatch):
+    monkeypatch.setattr(db, 'submit_write', lambda *args, **kwargs: pytest.fail('writer is not running'))
+    assert db.add_complaint('s1', 'no writer') == 1
+
+def test_failed_write_does_not_roll_back_its_batch(submitted):
+    barrier = threading.Barrier(9)
+    errors = []
+
+    def worker(i):
+        barrier.wait()
+        try:
+            if i == 4:
+                db.submit_write(db.add_complaint.__wrapped__, None, 'violates NOT NULL').result()
+            else:
+                db.add_complaint(f's{i}', f'complaint {i}')
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 1
+    assert db.count_complaints() == 8
+
+def test_concurrent_writes_all_commit(submitted):
+    def worker(i):
+        for j in range(25):
+            db.add_complaint(f's{i}', f'complaint {i}-{j}')
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert db.count_complaints() == 200
+    assert db.get_dashboard_summary()['complaints_total'] == 200